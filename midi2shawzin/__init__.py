@@ -9,7 +9,7 @@ __author__ = "HN_Anh"
 __email__ = "vl2anh1@gmail.com"
 
 # Import main components
-from .midi_io import read_midi, Event
+from .midi_io import read_midi, read_midi_fh, Event
 from .shawzin_mapping import scaleDict, scaleModulo, get_shawzin_char
 from .key_detection import detect_key_from_events
 from .quantize import quantize_events
@@ -43,7 +43,7 @@ def convert_midi_to_shawzin(midi_file: str, output_file: str = None, **kwargs) -
     return result['shawzin_text']
 
 __all__ = [
-    "read_midi", "Event", "scaleDict", "scaleModulo", "get_shawzin_char",
+    "read_midi", "read_midi_fh", "Event", "scaleDict", "scaleModulo", "get_shawzin_char",
     "detect_key_from_events", "quantize_events", "process_chord_events", 
     "ShawzinMapper", "map_notes_to_shawzin", "convert_midi_to_shawzin"
 ]
@@ -94,6 +94,43 @@ def analyze_chord_structure(notes: List[int]) -> Dict[str, int]:
     return analysis
 
 
+def _build_chord_mask_table(chord_dict: Dict[str, Tuple[int, ...]]) -> Tuple[Optional[str], ...]:
+    """Chord names indexed by 12-bit pitch-class mask (bit i: i semitones above root)."""
+    table: List[Optional[str]] = [None] * 4096
+    for name, pattern in chord_dict.items():
+        mask = 0
+        for interval in pattern:
+            mask |= 1 << (interval % 12)
+        # Patterns that fold to the same pitch classes keep the first name
+        if table[mask] is None:
+            table[mask] = name
+    return tuple(table)
+
+
+# Pitch-class-set lookup table for the default chord dictionary
+CHORD_BY_MASK = _build_chord_mask_table(chordDict)
+
+
+def identify_chord(notes: List[int]) -> Optional[str]:
+    """
+    Identify a chord from its pitch-class set relative to the lowest note.
+    
+    Args:
+        notes: List of MIDI note numbers
+        
+    Returns:
+        Chord name from chordDict, or None if no pattern matches
+    """
+    if not notes:
+        return None
+    
+    root = min(notes)
+    mask = 0
+    for note in notes:
+        mask |= 1 << ((note - root) % 12)
+    return CHORD_BY_MASK[mask]
+
+
 def reduce_chord(notes_in_chord: List[int], 
                 policy: Literal['reduce', 'arpeggiate'] = 'reduce',
                 max_notes: int = 3) -> List[int]:
@@ -6,13 +6,15 @@ with various options for key detection, quantization, chord handling, and output
 """
 
 import argparse
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 import time
 
 # Import all conversion modules
-from .midi_io import read_midi, choose_melody_track, get_note_events, merge_note_events, Event, NoteEvent
+from .midi_io import read_midi_fh, choose_melody_track, get_note_events, merge_note_events, Event, NoteEvent
 from .key_detection import detect_key_from_events, KeyDetector
 from .quantize import quantize_events, QuantizeSettings
 from .chord_handling import process_chord_events, ChordPolicy
@@ -20,6 +22,7 @@ from .mapper import build_playable_table, map_events_to_shawzin_events, find_bes
 from .encoder import (
     events_to_shawzin_text, 
     write_shawzin_file,
+    write_shawzin_lines,
     ShawzinEncoder,
     EncodingSettings
 )
@@ -46,12 +49,16 @@ Examples:
   
   # Human-readable mode with pattern detection
   python -m midi2shawzin.cli input.mid --mode human --detect-patterns
+  
+  # Convert every MIDI file in a directory using 4 worker processes
+  python -m midi2shawzin.cli --batch songs/ --jobs 4
         """
     )
     
     # Input/Output
     parser.add_argument(
         'input',
+        nargs='?',
         help='Input MIDI file path'
     )
     parser.add_argument(
@@ -59,6 +66,19 @@ Examples:
         help='Output file path (auto-generated if not specified)'
     )
     
+    # Batch Conversion
+    parser.add_argument(
+        '--batch',
+        metavar='DIR',
+        help='Convert all .mid/.midi files in DIR (outputs written next to inputs)'
+    )
+    parser.add_argument(
+        '--jobs',
+        type=int,
+        default=None,
+        help='Number of worker processes for --batch (default: CPU count)'
+    )
+    
     # Scale and Key Detection
     parser.add_argument(
         '--scale-override',
@@ -144,11 +164,85 @@ Examples:
     return parser
 
 
+def _convert_one(job: Tuple[str, Dict[str, Any]]) -> Tuple[str, Optional[str]]:
+    """
+    Convert a single file for batch mode.
+    
+    Top-level so it can be pickled into worker processes.
+    
+    Args:
+        job: Tuple of (input_file, convert_midi_file keyword options)
+        
+    Returns:
+        Tuple of (input_file, error message or None on success)
+    """
+    input_file, options = job
+    try:
+        convert_midi_file(input_file=input_file, **options)
+        return input_file, None
+    except Exception as e:
+        return input_file, str(e)
+
+
+def find_midi_files(directory: str) -> List[str]:
+    """
+    List MIDI files in a directory, sorted by name.
+    
+    Args:
+        directory: Directory to scan (not recursive)
+        
+    Returns:
+        List of .mid/.midi file paths
+    """
+    directory_path = Path(directory)
+    if not directory_path.is_dir():
+        raise NotADirectoryError(f"Batch directory not found: {directory}")
+    
+    return sorted(
+        str(path) for path in directory_path.iterdir()
+        if path.is_file() and path.suffix.lower() in ('.mid', '.midi')
+    )
+
+
+def convert_batch(input_files: List[str],
+                  jobs: Optional[int] = None,
+                  **options) -> List[Tuple[str, Optional[str]]]:
+    """
+    Convert many MIDI files in parallel worker processes.
+    
+    Each conversion is independent, so files are distributed across a
+    process pool. Output files are auto-generated next to each input.
+    
+    Args:
+        input_files: Input MIDI file paths
+        jobs: Number of worker processes (CPU count if None)
+        **options: Keyword options forwarded to convert_midi_file
+        
+    Returns:
+        List of (input_file, error message or None) in input order
+    """
+    if not input_files:
+        return []
+    
+    options.pop('output_file', None)
+    work = [(input_file, options) for input_file in input_files]
+    
+    with ProcessPoolExecutor(max_workers=jobs or os.cpu_count()) as executor:
+        return list(executor.map(_convert_one, work))
+
+
 def main():
     """Main CLI entrypoint."""
     parser = create_argument_parser()
     args = parser.parse_args()
     
+    if args.batch:
+        if args.input or args.output:
+            parser.error("--batch cannot be combined with an input file or --output")
+        return _run_batch(args)
+    if args.input is None:
+        parser.error("an input MIDI file or --batch DIR is required")
+    
     try:
         start_time = time.time()
         
@@ -182,6 +276,45 @@ def main():
         return 1
 
 
+def _run_batch(args: argparse.Namespace) -> int:
+    """Run --batch mode and report per-file failures."""
+    try:
+        start_time = time.time()
+        
+        input_files = find_midi_files(args.batch)
+        results = convert_batch(
+            input_files,
+            jobs=args.jobs,
+            scale_override=args.scale_override,
+            detect_key=args.detect_key,
+            mode=args.mode,
+            quantize_subdivision=args.quantize_subdivision,
+            keep_offsets=args.keep_offsets,
+            chord_policy=args.chord_policy,
+            detect_patterns=args.detect_patterns,
+            min_pattern_length=args.min_pattern_length,
+            verbose=args.verbose,
+            show_stats=args.stats
+        )
+        
+        failures = [(input_file, error) for input_file, error in results if error]
+        for input_file, error in failures:
+            print(f"Error: {input_file}: {error}", file=sys.stderr)
+        
+        elapsed_time = time.time() - start_time
+        print(f"\nBatch converted {len(results) - len(failures)}/{len(results)} files "
+              f"in {elapsed_time:.2f} seconds")
+        
+        return 1 if failures else 0
+        
+    except Exception as e:
+        print(f"Error: {e}", file=sys.stderr)
+        if args.verbose:
+            import traceback
+            traceback.print_exc()
+        return 1
+
+
 def convert_midi_file(input_file: str,
                      output_file: Optional[str] = None,
                      scale_override: Optional[int] = None,
@@ -217,10 +350,7 @@ def convert_midi_file(input_file: str,
     if verbose:
         print(f"Loading MIDI file: {input_file}")
     
-    # Validate input file
     input_path = Path(input_file)
-    if not input_path.exists():
-        raise FileNotFoundError(f"Input file not found: {input_file}")
     
     # Generate output filename if not provided
     if output_file is None:
@@ -244,12 +374,20 @@ def convert_midi_file(input_file: str,
         'key_detected': None
     }
     
+    # Validate the input by opening it once, outside the conversion's error
+    # reporting; the handle is entered by the with block right below
     try:
-        # Step 1: Load MIDI file
-        if verbose:
-            print("Step 1: Loading MIDI events...")
-        
-        midi_data = read_midi(input_file)
+        input_fh = open(input_file, 'rb')
+    except FileNotFoundError:
+        raise FileNotFoundError(f"Input file not found: {input_file}") from None
+    
+    try:
+        with input_fh:
+            # Step 1: Load MIDI file
+            if verbose:
+                print("Step 1: Loading MIDI events...")
+            
+            midi_data = read_midi_fh(input_fh)
         melody_track = choose_melody_track(midi_data)
         events = get_note_events(midi_data, melody_track)
         events = merge_note_events(events)
@@ -278,23 +416,23 @@ def convert_midi_file(input_file: str,
         
         stats['scale_used'] = scale_id
         
-        # Step 3: Quantize timing
-        if verbose:
-            print("Step 3: Quantizing timing...")
-        
-        quantize_settings = QuantizeSettings(subdivision=quantize_subdivision)
-        if not keep_offsets:
+        # Step 3: Quantize timing (skipped entirely when keeping offsets)
+        if keep_offsets:
+            quantized_events = events
+        else:
+            if verbose:
+                print("Step 3: Quantizing timing...")
+            
+            quantize_settings = QuantizeSettings(subdivision=quantize_subdivision)
             quantized_events = quantize_events(
                 events, 
                 midi_data['ticks_per_beat'], 
                 midi_data.get('tempo', 500000),
                 quantize_settings
             )
-        else:
-            quantized_events = events
-        
-        if verbose:
-            print(f"  Quantized to {quantize_subdivision}th note grid")
+            
+            if verbose:
+                print(f"  Quantized to {quantize_subdivision}th note grid")
         
         # Step 4: Process chords
         if verbose:
@@ -340,8 +478,7 @@ def convert_midi_file(input_file: str,
         if verbose:
             print("Step 6: Encoding to Shawzin format...")
         
-        encoding_settings = EncodingSettings()
-        encoding_settings.scale_id = scale_id
+        encoding_settings = EncodingSettings(scale_id=scale_id)
         
         if mode == 'melody-only':
             shawzin_lines = events_to_shawzin_text(
@@ -351,10 +488,10 @@ def convert_midi_file(input_file: str,
             )
         elif mode == 'full':
             encoder = ShawzinEncoder(encoding_settings)
-            shawzin_lines = encoder.encode_events(shawzin_events, mode='full')
+            shawzin_lines = encoder.encode_events_full(shawzin_events)
         else:  # human mode
             encoder = ShawzinEncoder(encoding_settings)
-            shawzin_lines = encoder.encode_events(shawzin_events, mode='melody')
+            shawzin_lines = encoder.encode_events_melody(shawzin_events)
         
         if verbose:
             print(f"  Generated {len(shawzin_lines)} output lines")
@@ -394,19 +531,16 @@ def convert_midi_file(input_file: str,
         if verbose:
             print("Step 8: Writing output file...")
         
-        if mode == 'human':
-            # Write human-readable format
-            content = f"# Shawzin Conversion - {input_path.name}\n"
-            content += f"# Scale: {scale_id} ({stats['key_detected']})\n"
-            content += f"# Notes: {stats['notes_converted']}/{stats['notes_processed']}\n"
-            content += f"# Mode: {mode}\n\n"
-            content += '\n'.join(shawzin_lines)
-        else:
-            # Write standard Shawzin format
-            content = '\n'.join(shawzin_lines)
-        
         with open(output_file, 'w', encoding='utf-8') as f:
-            f.write(content)
+            if mode == 'human':
+                # Write human-readable header ahead of the Shawzin lines
+                f.writelines([
+                    f"# Shawzin Conversion - {input_path.name}\n",
+                    f"# Scale: {scale_id} ({stats['key_detected']})\n",
+                    f"# Notes: {stats['notes_converted']}/{stats['notes_processed']}\n",
+                    f"# Mode: {mode}\n\n",
+                ])
+            write_shawzin_lines(f, shawzin_lines)
         
         if verbose:
             print(f"  Written to: {output_file}")
@@ -6,14 +6,20 @@ time encoding, delta-time encoding, and chunking for file output.
 """
 
 import math
-from typing import List, Tuple, Optional, Dict, Any
-from dataclasses import dataclass
+from itertools import accumulate
+from operator import add, attrgetter
+from typing import List, Tuple, Optional, Dict, Any, TextIO, Union
+from dataclasses import dataclass, field
 from pathlib import Path
 from .mapper import ShawzinNote
-from .shawzin_mapping import base64_chars
+from .shawzin_mapping import base64_chars, BASE64_STR, BASE64_BYTES
 
+# Module-local alias for the default alphabet; the public functions
+# shadow the name base64_chars with a parameter of the same name
+_BASE64 = base64_chars
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class EncodingSettings:
     """Settings for Shawzin string encoding based on official Warframe limits."""
     seconds_per_measure: float = 4.0      # Duration of one measure in seconds
@@ -24,6 +30,45 @@ class EncodingSettings:
     max_playback_seconds: float = 256.0   # Maximum playback duration (Warframe limit)
     keep_offsets: bool = True             # Whether to preserve timing offsets
     scale_id: int = 1                     # Default scale ID for headers
+    events_sorted: bool = True            # Events arrive in time order (delta encoding assumes it)
+    
+    # Derived timing constants, computed once in __post_init__
+    ticks_per_measure: int = field(init=False, repr=False, compare=False)
+    inv_seconds_per_tick: float = field(init=False, repr=False, compare=False)
+    # Mask/shift replacing % and // when ticks_per_measure is a power of two
+    tpm_mask: Optional[int] = field(init=False, repr=False, compare=False)
+    tpm_shift: int = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        """Precompute timing values that are invariant across an encode."""
+        ticks_per_measure = max(1, round(self.seconds_per_measure / self.seconds_per_tick))
+        object.__setattr__(self, 'ticks_per_measure', ticks_per_measure)
+        object.__setattr__(self, 'inv_seconds_per_tick', 1.0 / self.seconds_per_tick)
+        if ticks_per_measure & (ticks_per_measure - 1) == 0:
+            object.__setattr__(self, 'tpm_mask', ticks_per_measure - 1)
+            object.__setattr__(self, 'tpm_shift', ticks_per_measure.bit_length() - 1)
+        else:
+            object.__setattr__(self, 'tpm_mask', None)
+            object.__setattr__(self, 'tpm_shift', 0)
+
+
+# Shared default settings, reused whenever callers don't pass their own
+# (EncodingSettings is frozen, so sharing one instance is safe)
+_DEFAULT_ENCODING_SETTINGS = EncodingSettings()
+
+# Reverse lookup for the default alphabet: ord(char) -> index, 0xFF if invalid
+_B64_DECODE = bytearray(b'\xff' * 256)
+for _index, _code in enumerate(BASE64_BYTES):
+    _B64_DECODE[_code] = _index
+del _index, _code
+
+# Every two-character time code for 64 ticks per measure (the default
+# settings), indexed by total_ticks & 0xFFF
+_TIME_TABLE = tuple(measure_char + tick_char
+                    for measure_char in BASE64_STR for tick_char in BASE64_STR)
+
+# ASCII bytes that are not token characters, removed via bytes.translate
+_NON_TOKEN_BYTES = bytes(code for code in range(128) if not chr(code).isalnum())
 
 
 def time_to_shawzin_time(delta_seconds: float, 
@@ -47,7 +92,7 @@ def time_to_shawzin_time(delta_seconds: float,
         Two-character time string
     """
     if base64_chars is None:
-        base64_chars = globals()['base64_chars']
+        base64_chars = _BASE64
     
     # Calculate total ticks from delta time
     total_ticks = max(0, round(delta_seconds / seconds_per_tick))
@@ -66,6 +111,44 @@ def time_to_shawzin_time(delta_seconds: float,
     return measure_char + tick_char
 
 
+def _encode_time_fast(delta_seconds: float, settings: EncodingSettings) -> str:
+    """Encode delta time using the settings' precomputed timing constants."""
+    total_ticks = max(0, round(delta_seconds * settings.inv_seconds_per_tick))
+    if settings.ticks_per_measure == 64:
+        return _TIME_TABLE[total_ticks & 0xFFF]
+    tpm_mask = settings.tpm_mask
+    if tpm_mask is not None:
+        measure_index = total_ticks >> settings.tpm_shift
+        tick_index = total_ticks & tpm_mask
+    else:
+        measure_index, tick_index = divmod(total_ticks, settings.ticks_per_measure)
+    return BASE64_STR[measure_index & 63] + BASE64_STR[tick_index & 63]
+
+
+def _encode_times(deltas: List[float], settings: EncodingSettings) -> List[str]:
+    """
+    Encode a whole sequence of delta times in two flat passes.
+    
+    Equivalent to calling _encode_time_fast() per delta, but with the
+    timing constants hoisted out of the loop.
+    """
+    inv_seconds_per_tick = settings.inv_seconds_per_tick
+    ticks_per_measure = settings.ticks_per_measure
+    
+    total_ticks = [max(0, round(delta * inv_seconds_per_tick)) for delta in deltas]
+    if ticks_per_measure == 64:
+        time_table = _TIME_TABLE
+        return [time_table[ticks & 0xFFF] for ticks in total_ticks]
+    b64 = BASE64_STR
+    tpm_mask = settings.tpm_mask
+    if tpm_mask is not None:
+        tpm_shift = settings.tpm_shift
+        return [b64[(ticks >> tpm_shift) & 63] + b64[ticks & tpm_mask & 63]
+                for ticks in total_ticks]
+    return [b64[(ticks // ticks_per_measure) & 63] + b64[(ticks % ticks_per_measure) & 63]
+            for ticks in total_ticks]
+
+
 def shawzin_time_to_seconds(time_str: str,
                            seconds_per_measure: float = 4.0,
                            seconds_per_tick: float = 0.0625,
@@ -82,18 +165,24 @@ def shawzin_time_to_seconds(time_str: str,
     Returns:
         Time in seconds
     """
-    if base64_chars is None:
-        base64_chars = globals()['base64_chars']
-    
     if len(time_str) != 2:
         raise ValueError(f"Time string must be 2 characters, got {len(time_str)}")
     
     # Decode characters to indices
-    try:
-        measure_index = base64_chars.index(time_str[0])
-        tick_index = base64_chars.index(time_str[1])
-    except ValueError as e:
-        raise ValueError(f"Invalid character in time string: {e}")
+    if base64_chars is None:
+        # Default alphabet: two table loads instead of linear scans
+        measure_code = ord(time_str[0])
+        tick_code = ord(time_str[1])
+        measure_index = _B64_DECODE[measure_code] if measure_code < 256 else 0xFF
+        tick_index = _B64_DECODE[tick_code] if tick_code < 256 else 0xFF
+        if measure_index == 0xFF or tick_index == 0xFF:
+            raise ValueError(f"Invalid character in time string: {time_str!r}")
+    else:
+        try:
+            measure_index = base64_chars.index(time_str[0])
+            tick_index = base64_chars.index(time_str[1])
+        except ValueError as e:
+            raise ValueError(f"Invalid character in time string: {e}")
     
     # Calculate ticks per measure
     ticks_per_measure = max(1, round(seconds_per_measure / seconds_per_tick))
@@ -122,18 +211,15 @@ def event_to_shawzin_token(shawzin_char: str,
         3-character token string
     """
     if settings is None:
-        settings = EncodingSettings()
+        settings = _DEFAULT_ENCODING_SETTINGS
     
-    # Encode timing
-    time_chars = time_to_shawzin_time(
-        quantized_delta_seconds,
-        settings.seconds_per_measure,
-        settings.seconds_per_tick,
-        base64_chars
-    )
+    # Default timing is a single table lookup, inlined to skip a call frame
+    if settings.ticks_per_measure == 64:
+        total_ticks = max(0, round(quantized_delta_seconds * settings.inv_seconds_per_tick))
+        return shawzin_char + _TIME_TABLE[total_ticks & 0xFFF]
     
     # Combine note and timing
-    return shawzin_char + time_chars
+    return shawzin_char + _encode_time_fast(quantized_delta_seconds, settings)
 
 
 def create_scale_header(scale_id: int) -> str:
@@ -172,17 +258,11 @@ def events_to_shawzin_text(events: List[ShawzinNote],
         List of text chunks (one per output file)
     """
     if settings is None:
-        settings = EncodingSettings()
+        settings = _DEFAULT_ENCODING_SETTINGS
     
     if not events:
         return [create_scale_header(settings.scale_id)]
     
-    chunks = []
-    current_chunk_lines = []
-    current_line = ""
-    notes_in_chunk = 0
-    last_time = 0.0
-    
     # Group events by scale_id for headers
     scale_id = events[0].scale_id if events else settings.scale_id
     
@@ -190,85 +270,95 @@ def events_to_shawzin_text(events: List[ShawzinNote],
     # Warframe expects single-line format: scale_id + notes (no newlines)
     needs_multiline = False  # Always use single-line format for Warframe compatibility
     
-    if needs_multiline:
-        # Use multiline format with header on separate line (disabled for Warframe)
-        current_line = create_scale_header(scale_id)
-        current_chunk_lines.append(current_line)
-        current_line = ""
+    # Encode all delta times up front rather than once per loop iteration
+    zero_time_code = _encode_time_fast(0.0, settings)
+    if keep_offsets:
+        times = list(map(attrgetter('time_sec'), events))
+        deltas = [times[0]] + [time - previous for previous, time in zip(times, times[1:])]
+        time_codes = _encode_times(deltas, settings)
     else:
-        # Use single line format with inline header (Warframe standard)
-        current_line = create_scale_header(scale_id)
-    
-    for event in events:
-        # Calculate delta time
-        if keep_offsets:
-            delta_time = event.time_sec - last_time
-            last_time = event.time_sec
-        else:
-            delta_time = 0.0  # No timing if offsets disabled
-        
-        # Create token for this event
-        token = event_to_shawzin_token(
-            event.character,
-            delta_time,
-            settings
-        )
-        
-        # Check if we need to start a new chunk
-        if notes_in_chunk >= max_notes:
-            # Finish current chunk
-            if current_line:
-                current_chunk_lines.append(current_line)
-            chunks.append('\n'.join(current_chunk_lines))
-            
-            # Start new chunk
-            current_chunk_lines = []
-            header_line = create_scale_header(event.scale_id)
-            current_chunk_lines.append(header_line)
-            current_line = ""
-            notes_in_chunk = 0
-            last_time = event.time_sec  # Reset time reference
-            
-            # Recalculate delta for new chunk
-            if keep_offsets:
-                delta_time = 0.0  # First note in chunk has no delta
-            
-            token = event_to_shawzin_token(
-                event.character,
-                delta_time,
-                settings
-            )
+        time_codes = [zero_time_code] * len(events)  # No timing if offsets disabled
+    characters = list(map(attrgetter('character'), events))
+    tokens = list(map(add, characters, time_codes))
+    
+    # Every token is three characters, so chunk and line boundaries are known
+    # up front: the chunk list is pre-sized and lines are sliced out of the
+    # token list instead of being grown one token at a time
+    notes_per_chunk = max(1, max_notes)
+    tokens_per_line = max(1, max_length // 3)
+    n_chunks = (len(tokens) + notes_per_chunk - 1) // notes_per_chunk
+    chunks = [None] * n_chunks
+    
+    for chunk_index in range(n_chunks):
+        chunk_start = chunk_index * notes_per_chunk
+        chunk_end = min(chunk_start + notes_per_chunk, len(tokens))
         
-        # Check if adding token would exceed line length
-        # Remove hard Warframe limit since longer strings work fine
-        if len(current_line) + len(token) > max_length:
-            # Start new line
-            current_chunk_lines.append(current_line)
-            current_line = token
+        if chunk_index == 0 and not needs_multiline:
+            # Use single line format with inline header (Warframe standard)
+            chunk_lines = []
+            line_prefix = create_scale_header(scale_id)
+        elif chunk_index == 0:
+            # Use multiline format with header on separate line (disabled for Warframe)
+            chunk_lines = [create_scale_header(scale_id)]
+            line_prefix = ''
         else:
-            # Add to current line
-            current_line += token
+            # Start new chunk with a header line
+            chunk_lines = [create_scale_header(events[chunk_start].scale_id)]
+            line_prefix = ''
+            # First note in chunk has no delta
+            tokens[chunk_start] = characters[chunk_start] + zero_time_code
         
-        notes_in_chunk += 1
-    
-    # Finish final chunk
-    if current_line:
-        current_chunk_lines.append(current_line)
-    if current_chunk_lines:
-        chunks.append('\n'.join(current_chunk_lines))
+        # Fill whatever room the first line has left, then wrap the rest
+        # Remove hard Warframe limit since longer strings work fine
+        first_line_end = min(chunk_end,
+                             chunk_start + max(0, (max_length - len(line_prefix)) // 3))
+        chunk_lines.append(line_prefix + ''.join(tokens[chunk_start:first_line_end]))
+        chunk_lines.extend(''.join(tokens[line_start:min(line_start + tokens_per_line, chunk_end)])
+                           for line_start in range(first_line_end, chunk_end, tokens_per_line))
+        chunks[chunk_index] = '\n'.join(chunk_lines)
+    
+    return chunks
+
+
+# Output buffer size for Shawzin text files
+_WRITE_BUFFER_SIZE = 1 << 16
+
+
+def write_shawzin_lines(f: TextIO, lines: List[str]):
+    """
+    Write lines separated by newlines without joining them into one string.
     
-    return chunks if chunks else [create_scale_header(scale_id)]
+    Args:
+        f: Open text file handle
+        lines: Lines to write (no trailing newline is added)
+    """
+    if not lines:
+        return
+    f.write(lines[0])
+    for line in lines[1:]:
+        f.write('\n')
+        f.write(line)
+
+
+def _write_chunk(file_path: Union[str, Path], chunk: Union[str, List[str]]):
+    """Write a single chunk, streaming it if it is given as a list of lines."""
+    with open(file_path, 'w', encoding='utf-8', buffering=_WRITE_BUFFER_SIZE) as f:
+        if isinstance(chunk, str):
+            f.write(chunk)
+        else:
+            write_shawzin_lines(f, chunk)
 
 
 def write_shawzin_file(output_path: str, 
-                      shawzin_chunks: List[str],
+                      shawzin_chunks: List[Union[str, List[str]]],
                       mode: str = 'melody') -> List[str]:
     """
     Write Shawzin string chunks to file(s).
     
     Args:
         output_path: Base output path (without extension)
-        shawzin_chunks: List of text chunks to write
+        shawzin_chunks: List of text chunks to write; a chunk may also be
+            given as a list of lines, which is written without joining
         mode: Output mode ('melody' for single file, 'full' for multiple files)
         
     Returns:
@@ -280,21 +370,18 @@ def write_shawzin_file(output_path: str,
     if mode == 'melody' or len(shawzin_chunks) == 1:
         # Single file output
         file_path = output_path.with_suffix('.txt')
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(shawzin_chunks[0])
+        _write_chunk(file_path, shawzin_chunks[0])
         written_files.append(str(file_path))
     
     else:
-        # Multiple file output (full mode)
+        # Multiple file output (full mode); paths are built from strings
+        # resolved once, rather than a new Path per chunk
+        first_path = str(output_path.with_suffix('.txt'))
+        path_prefix = str(output_path.with_suffix(''))
         for i, chunk in enumerate(shawzin_chunks):
-            if i == 0:
-                file_path = output_path.with_suffix('.txt')
-            else:
-                file_path = output_path.with_name(f"{output_path.stem}_{i+1}.txt")
-            
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(chunk)
-            written_files.append(str(file_path))
+            file_path = first_path if i == 0 else f"{path_prefix}_{i+1}.txt"
+            _write_chunk(file_path, chunk)
+            written_files.append(file_path)
     
     return written_files
 
@@ -341,26 +428,36 @@ def read_shawzin_file(file_path: str) -> Tuple[int, List[Tuple[str, float]]]:
         token_content = content
     
     # Filter out whitespace and newlines, keep only valid token characters
-    filtered_content = ''.join(c for c in token_content if c.isalnum())
-    
-    # Parse note tokens
-    notes = []
-    current_time = 0.0
-    
-    # Process in 3-character chunks
-    for i in range(0, len(filtered_content), 3):
-        if i + 2 < len(filtered_content):
-            token = filtered_content[i:i+3]
-            char = token[0]
-            time_str = token[1:3]
-            
-            # Decode timing
-            delta_seconds = shawzin_time_to_seconds(time_str)
-            current_time += delta_seconds
-            
-            notes.append((char, current_time))
-    
-    return scale_id, notes
+    if token_content.isascii():
+        filtered_content = token_content.encode('ascii').translate(
+            None, _NON_TOKEN_BYTES).decode('ascii')
+    else:
+        filtered_content = ''.join(c for c in token_content if c.isalnum())
+    
+    # Split complete 3-character tokens into note and time character columns
+    token_end = len(filtered_content) - len(filtered_content) % 3
+    note_chars = filtered_content[0:token_end:3]
+    measure_chars = filtered_content[1:token_end:3]
+    tick_chars = filtered_content[2:token_end:3]
+    
+    # Only time characters must decode; note characters and a trailing partial
+    # token pass through unchecked. ASCII letters and digits are all in the
+    # base64 alphabet, so the only invalid time characters are non-ASCII ones
+    if not (measure_chars.isascii() and tick_chars.isascii()):
+        raise ValueError("Invalid character in time string")
+    
+    # Decode all time characters through the reverse lookup table at once
+    decode = _B64_DECODE
+    measure_indices = [decode[code] for code in measure_chars.encode('ascii')]
+    tick_indices = [decode[code] for code in tick_chars.encode('ascii')]
+    
+    # Accumulate delta times into absolute note times
+    ticks_per_measure = _DEFAULT_ENCODING_SETTINGS.ticks_per_measure
+    seconds_per_tick = _DEFAULT_ENCODING_SETTINGS.seconds_per_tick
+    deltas = [(measure_index * ticks_per_measure + tick_index) * seconds_per_tick
+              for measure_index, tick_index in zip(measure_indices, tick_indices)]
+    
+    return scale_id, list(zip(note_chars, accumulate(deltas)))
 
 
 class ShawzinEncoder:
@@ -368,7 +465,7 @@ class ShawzinEncoder:
     
     def __init__(self, settings: Optional[EncodingSettings] = None):
         """Initialize encoder with settings."""
-        self.settings = settings or EncodingSettings()
+        self.settings = settings or _DEFAULT_ENCODING_SETTINGS
         self.stats = {
             'notes_encoded': 0,
             'chunks_created': 0,
@@ -387,32 +484,59 @@ class ShawzinEncoder:
         Returns:
             List of encoded text chunks
         """
-        # Adjust settings based on mode
         if mode == 'melody':
-            # Melody mode: more permissive chunking
-            max_notes = self.settings.max_notes_per_chunk * 2
-            keep_offsets = True
-        else:
-            # Full mode: strict chunking
-            max_notes = self.settings.max_notes_per_chunk
-            keep_offsets = self.settings.keep_offsets
+            return self.encode_events_melody(events)
+        return self.encode_events_full(events)
+    
+    def encode_events_melody(self, events: List[ShawzinNote]) -> List[str]:
+        """
+        Encode events in melody mode: permissive chunking, offsets always kept.
         
-        # Encode to text chunks
+        Args:
+            events: List of ShawzinNote objects
+            
+        Returns:
+            List of encoded text chunks
+        """
         chunks = events_to_shawzin_text(
             events,
-            max_notes=max_notes,
+            max_notes=self.settings.max_notes_per_chunk * 2,
             max_length=self.settings.max_length_per_line,
-            keep_offsets=keep_offsets,
+            keep_offsets=True,
             settings=self.settings
         )
+        self._update_stats(events, chunks)
+        return chunks
+    
+    def encode_events_full(self, events: List[ShawzinNote]) -> List[str]:
+        """
+        Encode events in full mode: strict chunking, offsets per settings.
         
-        # Update statistics
+        Args:
+            events: List of ShawzinNote objects
+            
+        Returns:
+            List of encoded text chunks
+        """
+        chunks = events_to_shawzin_text(
+            events,
+            max_notes=self.settings.max_notes_per_chunk,
+            max_length=self.settings.max_length_per_line,
+            keep_offsets=self.settings.keep_offsets,
+            settings=self.settings
+        )
+        self._update_stats(events, chunks)
+        return chunks
+    
+    def _update_stats(self, events: List[ShawzinNote], chunks: List[str]):
+        """Update encoding statistics after an encode call."""
         self.stats['notes_encoded'] = len(events)
         self.stats['chunks_created'] = len(chunks)
         if events:
-            self.stats['total_duration'] = max(e.time_sec for e in events)
-        
-        return chunks
+            if self.settings.events_sorted:
+                self.stats['total_duration'] = events[-1].time_sec
+            else:
+                self.stats['total_duration'] = max(e.time_sec for e in events)
     
     def encode_to_file(self, events: List[ShawzinNote], 
                       output_path: str,
@@ -542,24 +666,30 @@ def analyze_timing_accuracy(events: List[ShawzinNote],
         Dictionary with timing analysis
     """
     if settings is None:
-        settings = EncodingSettings()
+        settings = _DEFAULT_ENCODING_SETTINGS
     
     if not events:
         return {'quantization_error': 0.0, 'max_error': 0.0, 'precision': 1.0}
     
-    quantization_errors = []
+    # Compute the encode/decode round trip arithmetically: a delta encodes to
+    # round(delta / tick) ticks, stored as 6-bit measure and tick indices
+    inv_seconds_per_tick = settings.inv_seconds_per_tick
+    seconds_per_tick = settings.seconds_per_tick
+    ticks_per_measure = settings.ticks_per_measure
+    tpm_mask = settings.tpm_mask
+    tpm_shift = settings.tpm_shift
     
-    for i, event in enumerate(events):
-        if i > 0:
-            # Calculate delta time
-            delta_time = event.time_sec - events[i-1].time_sec
-            
-            # Encode and decode to see quantization error
-            token = event_to_shawzin_token(event.character, delta_time, settings)
-            decoded_time = shawzin_time_to_seconds(token[1:3])
-            
-            error = abs(delta_time - decoded_time)
-            quantization_errors.append(error)
+    times = list(map(attrgetter('time_sec'), events))
+    deltas = [time - previous for previous, time in zip(times, times[1:])]
+    quantization_errors = []
+    for delta_time in deltas:
+        ticks = max(0, round(delta_time * inv_seconds_per_tick))
+        if tpm_mask is not None:
+            measure_index, tick_index = ticks >> tpm_shift, ticks & tpm_mask
+        else:
+            measure_index, tick_index = divmod(ticks, ticks_per_measure)
+        decoded_ticks = (measure_index & 63) * ticks_per_measure + (tick_index & 63)
+        quantization_errors.append(abs(delta_time - decoded_ticks * seconds_per_tick))
     
     if not quantization_errors:
         return {'quantization_error': 0.0, 'max_error': 0.0, 'precision': 1.0}
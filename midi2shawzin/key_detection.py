@@ -7,8 +7,11 @@ pitch class histogram analysis and coverage scoring (Krumhansl-Schmuckler-like a
 
 from typing import Dict, List, Tuple, Optional, Set
 from collections import Counter
+from functools import lru_cache
+from operator import itemgetter
+import heapq
 import math
-from .shawzin_mapping import scaleDict, PITCH_CLASS_NAMES
+from .shawzin_mapping import scaleDict, PITCH_CLASS_NAMES, PC_OF_MIDI
 from .midi_io import Event, NoteEvent
 
 # Scale templates: sets of pitch classes for each scale type
@@ -55,6 +58,23 @@ SCALE_NAMES = {
     9: "Whole Tone"
 }
 
+def _rotate_mask(mask: int, root: int) -> int:
+    """Transpose a 12-bit pitch class mask up by root semitones."""
+    return ((mask << root) | (mask >> (12 - root))) & 0xFFF
+
+# Scale templates as 12-bit masks (bit pc set if pc is in the scale),
+# precomputed for every root: SCALE_MASKS[scale_id][root]
+SCALE_MASKS = {
+    scale_id: tuple(_rotate_mask(sum(1 << pc for pc in template), root) for root in range(12))
+    for scale_id, template in SCALE_TEMPLATES.items()
+}
+
+# Masks for every (scale 1-9, root) pair, in scale-major order
+_ALL_KEY_MASKS = [SCALE_MASKS[scale_id][root] for scale_id in range(1, 10) for root in range(12)]
+
+# Event types that contribute to the pitch class histogram
+_NOTE_EVENT_TYPES = frozenset(('note_on', 'note'))
+
 def build_pitch_class_histogram(events: List[Event]) -> List[float]:
     """
     Build normalized pitch class histogram from note events.
@@ -70,18 +90,17 @@ def build_pitch_class_histogram(events: List[Event]) -> List[float]:
     total_weight = 0.0
     
     # Process note events
+    note_types = _NOTE_EVENT_TYPES
+    pitch_class_of = PC_OF_MIDI
     for event in events:
-        if event.note is not None and event.type in ['note_on', 'note']:
-            pitch_class = event.note % 12
-            
+        if event.note is not None and event.type in note_types:
             # Weight by duration and velocity
-            duration = getattr(event, 'delta_sec', 0.25)  # Default duration if not available
-            velocity = event.velocity if event.velocity > 0 else 80
+            velocity = event.velocity
             
             # Calculate weight: longer and louder notes have more influence
-            weight = duration * (velocity / 127.0)
+            weight = event.delta_sec * ((velocity if velocity > 0 else 80) / 127.0)
             
-            histogram[pitch_class] += weight
+            histogram[pitch_class_of[event.note]] += weight
             total_weight += weight
     
     # Normalize to probabilities
@@ -101,13 +120,13 @@ def get_scale_template(scale_id: int, root: int) -> Set[int]:
     Returns:
         Set of pitch classes in the scale
     """
-    if scale_id not in SCALE_TEMPLATES:
+    if scale_id not in SCALE_MASKS:
         # Default to chromatic if unknown scale
         return set(range(12))
     
-    base_template = SCALE_TEMPLATES[scale_id]
-    # Transpose template to root
-    return {(pc + root) % 12 for pc in base_template}
+    # Transposed template is precomputed as a mask
+    mask = SCALE_MASKS[scale_id][root % 12]
+    return {pc for pc in range(12) if mask >> pc & 1}
 
 def score_key(histogram: List[float], scale_template: Set[int]) -> float:
     """
@@ -120,42 +139,83 @@ def score_key(histogram: List[float], scale_template: Set[int]) -> float:
     Returns:
         Coverage score (0.0-1.0, higher = better match)
     """
-    # Coverage score: sum of histogram values for notes in scale
-    in_scale_score = sum(histogram[pc] for pc in scale_template)
-    
-    # Penalty for notes outside scale (stronger penalty)
-    out_of_scale_score = sum(histogram[pc] for pc in range(12) if pc not in scale_template)
-    
-    # Scale size factor: prefer scales that are more specific (smaller scales get bonus)
-    scale_size = len(scale_template)
-    specificity_bonus = (12 - scale_size) / 12.0 * 0.3  # Bonus for more specific scales
-    
-    # Completeness: how many scale notes are actually used
-    used_scale_notes = len([pc for pc in scale_template if histogram[pc] > 0.01])
-    completeness = used_scale_notes / scale_size if scale_size > 0 else 0
-    
-    # Dominance: how much of the total weight is in the strongest scale notes
-    scale_weights = [histogram[pc] for pc in scale_template]
-    scale_weights.sort(reverse=True)
-    top_3_weight = sum(scale_weights[:min(3, len(scale_weights))])
-    
-    # Combined score with multiple factors
-    base_score = in_scale_score - (0.8 * out_of_scale_score)  # Strong penalty for out-of-scale
-    completeness_bonus = 0.2 * completeness
-    dominance_bonus = 0.1 * top_3_weight
+    return _score_masks(histogram, [sum(1 << pc for pc in scale_template)])[0]
+
+@lru_cache(maxsize=None)
+def _mask_pitch_classes(mask: int) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+    """Split pitch classes 0-11 into those inside and outside a 12-bit mask."""
+    return (tuple(pc for pc in range(12) if mask >> pc & 1),
+            tuple(pc for pc in range(12) if not mask >> pc & 1))
+
+def _score_masks(histogram: List[float], masks: List[int],
+                 prune_margin: Optional[float] = None) -> List[Optional[float]]:
+    """
+    Score one histogram against many scale templates given as 12-bit masks.
     
-    final_score = base_score + completeness_bonus + dominance_bonus + specificity_bonus
+    Same scoring as score_key(), with everything that depends only on the
+    histogram computed once for the whole batch. With prune_margin set,
+    templates whose score provably falls more than prune_margin below the
+    best score so far are skipped and reported as None.
+    """
+    # Completeness: how many scale notes are actually used (popcount of used & scale)
+    used_mask = sum(1 << pc for pc in range(12) if histogram[pc] > 0.01)
+    best_score = 0.0
+    
+    scores = []
+    for mask in masks:
+        in_scale_pcs, out_of_scale_pcs = _mask_pitch_classes(mask)
+        scale_weights = [histogram[pc] for pc in in_scale_pcs]
+        
+        # Coverage score: sum of histogram values for notes in scale
+        in_scale_score = sum(scale_weights)
+        
+        # Penalty for notes outside scale (stronger penalty)
+        out_of_scale_score = sum([histogram[pc] for pc in out_of_scale_pcs])
+        
+        # Scale size factor: prefer scales that are more specific (smaller scales get bonus)
+        scale_size = len(in_scale_pcs)
+        specificity_bonus = (12 - scale_size) / 12.0 * 0.3  # Bonus for more specific scales
+        
+        if prune_margin is not None:
+            # Upper bound: full completeness, and all in-scale weight in the top 3
+            upper_bound = (in_scale_score - (0.8 * out_of_scale_score) + 0.2
+                           + 0.1 * in_scale_score + specificity_bonus)
+            if max(0.0, upper_bound) < best_score - prune_margin:
+                scores.append(None)
+                continue
+        
+        used_scale_notes = (mask & used_mask).bit_count()
+        completeness = used_scale_notes / scale_size if scale_size > 0 else 0
+        
+        # Dominance: how much of the total weight is in the strongest scale notes
+        scale_weights.sort(reverse=True)
+        top_3_weight = sum(scale_weights[:3])
+        
+        # Combined score with multiple factors
+        base_score = in_scale_score - (0.8 * out_of_scale_score)  # Strong penalty for out-of-scale
+        completeness_bonus = 0.2 * completeness
+        dominance_bonus = 0.1 * top_3_weight
+        
+        final_score = base_score + completeness_bonus + dominance_bonus + specificity_bonus
+        
+        final_score = max(0.0, final_score)  # Ensure non-negative
+        if final_score > best_score:
+            best_score = final_score
+        scores.append(final_score)
     
-    return max(0.0, final_score)  # Ensure non-negative
+    return scores
 
 def detect_best_scale(events: List[Event], 
-                     candidate_scales: Optional[List[int]] = None) -> Tuple[int, int, float]:
+                     candidate_scales: Optional[List[int]] = None,
+                     *,
+                     histogram: Optional[List[float]] = None) -> Tuple[int, int, float]:
     """
     Detect the best-fitting scale for given note events.
     
     Args:
         events: List of note events to analyze
         candidate_scales: List of scale IDs to test (default: all 1-9)
+        histogram: Pitch class histogram of events, if already built
         
     Returns:
         Tuple of (root_pitch_class, scale_id, score)
@@ -164,16 +224,17 @@ def detect_best_scale(events: List[Event],
         candidate_scales = list(range(1, 10))  # All Shawzin scales
     
     # Build pitch class histogram
-    histogram = build_pitch_class_histogram(events)
-    
-    best_candidates = []
-    
-    # Test all combinations of root and scale
-    for scale_id in candidate_scales:
-        for root in range(12):
-            scale_template = get_scale_template(scale_id, root)
-            score = score_key(histogram, scale_template)
-            best_candidates.append((score, root, scale_id))
+    if histogram is None:
+        histogram = build_pitch_class_histogram(events)
+    
+    # Test all combinations of root and scale in one scoring pass, skipping
+    # candidates that cannot come within the 0.01 tie window of the best
+    keys = [(root, scale_id) for scale_id in candidate_scales for root in range(12)]
+    masks = [SCALE_MASKS[scale_id][root] if scale_id in SCALE_MASKS else 0xFFF
+             for root, scale_id in keys]
+    scores = _score_masks(histogram, masks, prune_margin=0.01 + 1e-9)
+    best_candidates = [(score, root, scale_id)
+                       for score, (root, scale_id) in zip(scores, keys) if score is not None]
     
     # Sort by score (descending)
     best_candidates.sort(reverse=True)
@@ -187,19 +248,25 @@ def detect_best_scale(events: List[Event],
         # For modal relationships (same notes, different tonic), 
         # prefer the root that has more emphasis in the melody
         if len(tied_candidates) <= 4:  # Likely modal relationship
+            # First/last note pitch classes (-1 if missing) are the same for every candidate
+            first_note_pc = -1
+            last_note_pc = -1
+            if events:
+                if events[0].note is not None:
+                    first_note_pc = events[0].note % 12
+                if events[-1].note is not None:
+                    last_note_pc = events[-1].note % 12
+            
             # Calculate emphasis for each candidate root
             root_emphasis = {}
             for root, scale_id in tied_candidates:
                 # Check histogram weight at this root
                 emphasis = histogram[root % 12]
                 # Add bonus for first/last note being the root
-                if events:
-                    first_note_pc = events[0].note % 12
-                    last_note_pc = events[-1].note % 12
-                    if first_note_pc == root:
-                        emphasis += 0.2
-                    if last_note_pc == root:
-                        emphasis += 0.2
+                if first_note_pc == root:
+                    emphasis += 0.2
+                if last_note_pc == root:
+                    emphasis += 0.2
                 root_emphasis[(root, scale_id)] = emphasis
             
             # Return candidate with highest root emphasis
@@ -221,35 +288,38 @@ def detect_best_scale(events: List[Event],
     return best_candidates[0][1], best_candidates[0][2], best_candidates[0][0]
 
 def analyze_key_confidence(events: List[Event], 
-                          top_n: int = 3) -> List[Tuple[int, int, float, str]]:
+                          top_n: int = 3,
+                          *,
+                          histogram: Optional[List[float]] = None) -> List[Tuple[int, int, float, str]]:
     """
     Analyze key detection confidence by returning top N candidates.
     
     Args:
         events: List of note events to analyze
         top_n: Number of top candidates to return
+        histogram: Pitch class histogram of events, if already built
         
     Returns:
         List of tuples: (root, scale_id, score, description)
     """
-    histogram = build_pitch_class_histogram(events)
-    candidates = []
-    
+    if histogram is None:
+        histogram = build_pitch_class_histogram(events)
     # Test all combinations
-    for scale_id in range(1, 10):
-        for root in range(12):
-            scale_template = get_scale_template(scale_id, root)
-            score = score_key(histogram, scale_template)
-            
-            root_name = PITCH_CLASS_NAMES[root]
-            scale_name = SCALE_NAMES.get(scale_id, f"Scale {scale_id}")
-            description = f"{root_name} {scale_name}"
-            
-            candidates.append((root, scale_id, score, description))
+    scores = _score_masks(histogram, _ALL_KEY_MASKS)
+    keys = ((root, scale_id) for scale_id in range(1, 10) for root in range(12))
+    scored = [(root, scale_id, score) for (root, scale_id), score in zip(keys, scores)]
     
-    # Sort by score and return top N
-    candidates.sort(key=lambda x: x[2], reverse=True)
-    return candidates[:top_n]
+    # Select top N by score (same order as a stable descending sort), and
+    # only describe the candidates that are returned
+    candidates = []
+    for root, scale_id, score in heapq.nlargest(top_n, scored, key=itemgetter(2)):
+        root_name = PITCH_CLASS_NAMES[root]
+        scale_name = SCALE_NAMES.get(scale_id, f"Scale {scale_id}")
+        description = f"{root_name} {scale_name}"
+        
+        candidates.append((root, scale_id, score, description))
+    
+    return candidates
 
 def get_scale_notes(scale_id: int, root: int, octave: int = 4) -> List[int]:
     """
@@ -263,13 +333,15 @@ def get_scale_notes(scale_id: int, root: int, octave: int = 4) -> List[int]:
     Returns:
         List of MIDI note numbers in scale
     """
-    scale_template = get_scale_template(scale_id, 0)  # Get base template
+    # Base template pitch classes in ascending order, read off the mask
+    base_mask = SCALE_MASKS[scale_id][0] if scale_id in SCALE_MASKS else 0xFFF
+    scale_pcs, _ = _mask_pitch_classes(base_mask)
     notes = []
     
     # Generate notes for 2 octaves
     for oct_offset in range(2):
         current_octave = octave + oct_offset
-        for pc in sorted(scale_template):
+        for pc in scale_pcs:
             midi_note = (current_octave * 12) + ((pc + root) % 12)
             if midi_note <= 127:  # Valid MIDI range
                 notes.append(midi_note)
@@ -282,6 +354,7 @@ class KeyDetector:
     def __init__(self):
         self.pitch_class_histogram: Counter[int] = Counter()
         self.last_analysis: Optional[Tuple[int, int, float]] = None
+        self.last_histogram: Optional[List[float]] = None
     
     def detect_key(self, events: List[Event]) -> Tuple[str, str]:
         """
@@ -293,7 +366,8 @@ class KeyDetector:
         Returns:
             Tuple of (key_name, scale_type) e.g. ("C", "Major (Heptatonic)")
         """
-        root, scale_id, score = detect_best_scale(events)
+        self.last_histogram = build_pitch_class_histogram(events)
+        root, scale_id, score = detect_best_scale(events, histogram=self.last_histogram)
         self.last_analysis = (root, scale_id, score)
         
         key_name = PITCH_CLASS_NAMES[root]
@@ -306,6 +380,22 @@ class KeyDetector:
         if self.last_analysis is None:
             return 0.0
         return min(1.0, self.last_analysis[2])  # Clamp to 1.0
+    
+    def get_key_candidates(self, top_n: int = 3) -> List[Tuple[int, int, float, str]]:
+        """
+        Get the top N key candidates for the last detection.
+        
+        Reuses the histogram built by detect_key() instead of rescanning events.
+        
+        Args:
+            top_n: Number of top candidates to return
+            
+        Returns:
+            List of tuples: (root, scale_id, score, description)
+        """
+        if self.last_histogram is None:
+            return []
+        return analyze_key_confidence([], top_n, histogram=self.last_histogram)
 
 def detect_key_from_events(events: List[Event]) -> Tuple[str, str]:
     """
@@ -6,13 +6,16 @@ with octave-shift heuristics for optimal playability.
 """
 
 from typing import List, Dict, Tuple, Optional, Set
+from array import array
 from dataclasses import dataclass
+from functools import lru_cache
+from bisect import bisect_left
 from collections import defaultdict
 from .midi_io import Event
-from .shawzin_mapping import scaleDict, scaleModulo, get_shawzin_char, base64_chars
+from .shawzin_mapping import scaleDict, get_scale_lut
 
 
-@dataclass
+@dataclass(slots=True)
 class ShawzinNote:
     """Represents a note mapped to Shawzin format."""
     character: str         # Shawzin character (1-3, q-e, a-d, z-c)
@@ -24,6 +27,35 @@ class ShawzinNote:
     octave_shift: int     # Number of octaves shifted
 
 
+@dataclass(slots=True)
+class ShawzinNoteArrays:
+    """
+    Mapped notes stored column-wise: one compact array per ShawzinNote field.
+    
+    Each note's character is one position in a single string. All notes
+    share one scale_id.
+    """
+    characters: str       # One Shawzin character per note
+    time_sec: array       # 'd': note timing in seconds
+    duration_sec: array   # 'd': note duration in seconds
+    original_midi: array  # 'h': original MIDI note number
+    mapped_midi: array    # 'h': mapped MIDI note (after octave shifts)
+    octave_shift: array   # 'h': number of octaves shifted
+    scale_id: int = 1     # Shawzin scale ID used
+    
+    def __len__(self) -> int:
+        return len(self.characters)
+    
+    def to_list(self) -> List[ShawzinNote]:
+        """Materialize ShawzinNote objects for code that expects a list."""
+        scale_id = self.scale_id
+        return [ShawzinNote(character, time_sec, duration_sec, original_midi,
+                            mapped_midi, scale_id, octave_shift)
+                for character, time_sec, duration_sec, original_midi, mapped_midi, octave_shift
+                in zip(self.characters, self.time_sec, self.duration_sec,
+                       self.original_midi, self.mapped_midi, self.octave_shift)]
+
+
 @dataclass
 class MappingSettings:
     """Settings for note mapping process."""
@@ -39,6 +71,9 @@ def build_playable_table(scale_id: int,
     """
     Build a table of playable MIDI notes to Shawzin characters for a given scale.
     
+    Tables are memoized internally per (scale_id, octave_range, base_octave);
+    each call returns a new list that the caller may modify.
+    
     Args:
         scale_id: Shawzin scale ID (1-9)
         octave_range: Tuple of (min_octave_offset, max_octave_offset)
@@ -47,42 +82,102 @@ def build_playable_table(scale_id: int,
     Returns:
         List of (midi_note, shawzin_char) tuples, sorted by MIDI note
     """
+    return list(_shared_playable_table(scale_id, octave_range, base_octave))
+
+
+def _shared_playable_table(scale_id: int,
+                           octave_range: Tuple[int, int] = (-2, 3),
+                           base_octave: int = 4) -> Tuple[Tuple[int, str], ...]:
+    """The memoized, read-only table behind build_playable_table()."""
+    # Normalize so list octave ranges and equal values share one cache entry
+    return _build_playable_table(scale_id, tuple(octave_range), int(base_octave))
+
+
+@lru_cache(maxsize=64)
+def _build_playable_table(scale_id: int,
+                          octave_range: Tuple[int, int],
+                          base_octave: int) -> Tuple[Tuple[int, str], ...]:
+    """Build one scale's playable table as a tuple sorted by MIDI note."""
     if scale_id not in scaleDict:
         raise ValueError(f"Invalid scale_id: {scale_id}")
     
-    playable_table = []
-    scale_chars = scaleDict[scale_id]
-    scale_length = scaleModulo[scale_id - 1]  # scaleModulo is 0-indexed
-    
     # Generate mappings across octave range
     min_octave = base_octave + octave_range[0]
     max_octave = base_octave + octave_range[1]
     
-    # Create a table mapping MIDI notes to characters
-    # We use a set to avoid duplicates
-    seen_notes = set()
-    
-    for octave in range(min_octave, max_octave + 1):
-        base_midi = octave * 12  # C note for this octave
-        
-        for char_idx in range(scale_length):
-            if char_idx in scale_chars:
-                char = scale_chars[char_idx]
-                
-                # Calculate MIDI note - use simple chromatic mapping
-                midi_note = base_midi + (char_idx % 12)
-                
-                # Ensure valid MIDI range and not duplicate
-                if 0 <= midi_note <= 127 and midi_note not in seen_notes:
-                    playable_table.append((midi_note, char))
-                    seen_notes.add(midi_note)
-    
-    # Sort by MIDI note for efficient searching
-    playable_table.sort(key=lambda x: x[0])
-    
+    # A character's MIDI note only depends on char_idx % 12, so each pitch
+    # class keeps the first character that lands on it (later ones would be
+    # duplicates) and every octave repeats the same pairs
+    pitch_class_chars = {}
+    for char_idx, char in enumerate(get_scale_lut(scale_id)):
+        if char is not None:
+            pitch_class_chars.setdefault(char_idx % 12, char)
+    base_pairs = sorted(pitch_class_chars.items())
+    
+    # Ascending octaves of ascending pitch classes: already sorted by MIDI note
+    playable_table = tuple((octave * 12 + pitch_class, char)
+                           for octave in range(min_octave, max_octave + 1)
+                           for pitch_class, char in base_pairs
+                           if 0 <= octave * 12 + pitch_class <= 127)
+    
+    _register_table(playable_table)
     return playable_table
 
 
+@dataclass(slots=True)
+class _TableInfo:
+    """Search data derived from a table built by _build_playable_table()."""
+    table: Tuple[Tuple[int, str], ...]      # Keeps the table alive so its id stays unique
+    keys: Tuple[int, ...]                   # Ascending MIDI notes, for bisecting
+    midi_lookup: Optional[Tuple[Tuple[str, int, int], ...]] = None
+    midi_deviations: Optional[Tuple[int, ...]] = None
+
+
+# Built tables by identity, so lookups never rehash a table; bounded like the
+# _build_playable_table cache, oldest entries dropped first
+_TABLE_INFO: Dict[int, _TableInfo] = {}
+_TABLE_INFO_MAX = 64
+
+
+def _register_table(playable_table: Tuple[Tuple[int, str], ...]) -> None:
+    """Record the bisect keys of a freshly built, ascending playable table."""
+    if len(_TABLE_INFO) >= _TABLE_INFO_MAX:
+        del _TABLE_INFO[next(iter(_TABLE_INFO))]
+    _TABLE_INFO[id(playable_table)] = _TableInfo(
+        playable_table, tuple(midi_note for midi_note, _ in playable_table))
+
+
+def _table_info(playable_table) -> Optional[_TableInfo]:
+    """Derived data of a table returned by _shared_playable_table(), else None."""
+    info = _TABLE_INFO.get(id(playable_table))
+    if info is not None and info.table is playable_table:
+        return info
+    return None
+
+
+def _ascending_keys(playable_table) -> Optional[Tuple[int, ...]]:
+    """Extract the table's MIDI notes if they are strictly ascending, else None."""
+    keys = tuple(midi_note for midi_note, _ in playable_table)
+    if all(lower < upper for lower, upper in zip(keys, keys[1:])):
+        return keys
+    return None
+
+
+def _nearest_index(note_midi: int, keys: Tuple[int, ...]) -> int:
+    """Index of the closest key to note_midi (the lower one on a tie)."""
+    index = bisect_left(keys, note_midi)
+    if index == len(keys) or (index > 0 and note_midi - keys[index - 1] <= keys[index] - note_midi):
+        return index - 1
+    return index
+
+
+def _octave_shift(best_midi: int, note_midi: int) -> int:
+    """Octave shift between a note and the table note it was mapped to."""
+    # Nearest octave, with an exact half octave rounding down: the same as
+    # floor division plus one when the remainder exceeds 6, without branches
+    return (best_midi - note_midi + 5) // 12
+
+
 def map_note_to_shawzin(note_midi: int, 
                        playable_table: List[Tuple[int, str]]) -> Tuple[str, int, int]:
     """
@@ -98,6 +193,12 @@ def map_note_to_shawzin(note_midi: int,
     if not playable_table:
         raise ValueError("Empty playable table")
     
+    # Shared built tables come with sorted keys: binary search
+    info = _table_info(playable_table)
+    if info is not None:
+        best_midi, best_char = playable_table[_nearest_index(note_midi, info.keys)]
+        return best_char, best_midi, _octave_shift(best_midi, note_midi)
+    
     # Find closest MIDI note in playable table
     best_midi = None
     best_char = None
@@ -110,14 +211,55 @@ def map_note_to_shawzin(note_midi: int,
             best_midi = midi_note
             best_char = char
     
-    # Calculate octave shift
-    octave_shift = (best_midi - note_midi) // 12
-    if (best_midi - note_midi) % 12 > 6:  # Handle wrap-around
-        octave_shift += 1
-    elif (best_midi - note_midi) % 12 < -6:
-        octave_shift -= 1
+    return best_char, best_midi, _octave_shift(best_midi, note_midi)
+
+
+def map_notes_batch(notes: List[int],
+                    playable_table: List[Tuple[int, str]]) -> List[Tuple[str, int, int]]:
+    """
+    Map many MIDI notes against one playable table.
+    
+    Equivalent to calling map_note_to_shawzin() per note, but the table's
+    search keys are extracted once and each note is found by binary search.
+    
+    Args:
+        notes: MIDI note numbers to map
+        playable_table: List of (midi_note, shawzin_char) tuples
+        
+    Returns:
+        List of (shawzin_char, nearest_midi, octave_shift), one per note
+    """
+    if not notes:
+        return []
+    if not playable_table:
+        raise ValueError("Empty playable table")
+    
+    info = _table_info(playable_table)
+    keys = info.keys if info is not None else _ascending_keys(playable_table)
+    if keys is None:
+        # Unsorted table: fall back to the linear scan
+        return [map_note_to_shawzin(note, playable_table) for note in notes]
     
-    return best_char, best_midi, octave_shift
+    results = []
+    for note_midi in notes:
+        best_midi, best_char = playable_table[_nearest_index(note_midi, keys)]
+        results.append((best_char, best_midi, _octave_shift(best_midi, note_midi)))
+    return results
+
+
+def _midi_lookup(info: _TableInfo) -> Tuple[Tuple[str, int, int], ...]:
+    """Mapping of every MIDI note 0-127 against a built table, indexed by note."""
+    if info.midi_lookup is None:
+        info.midi_lookup = tuple(map_notes_batch(range(128), info.table))
+    return info.midi_lookup
+
+
+def _midi_deviations(info: _TableInfo) -> Tuple[int, ...]:
+    """Semitone distance from every MIDI note 0-127 to its nearest table note."""
+    if info.midi_deviations is None:
+        info.midi_deviations = tuple(abs(mapped_midi - note)
+                                     for note, (_, mapped_midi, _) in enumerate(_midi_lookup(info)))
+    return info.midi_deviations
 
 
 def analyze_note_coverage(notes: List[int], 
@@ -137,19 +279,19 @@ def analyze_note_coverage(notes: List[int],
     if not notes:
         return {'coverage': 0.0, 'avg_deviation': 0.0, 'max_deviation': 0.0}
     
-    covered_notes = 0
-    total_deviation = 0
-    max_dev = 0
+    # Deviation of every note from its nearest playable note
+    info = _table_info(playable_table)
+    if info is not None and playable_table and min(notes) >= 0 and max(notes) <= 127:
+        # Built table: read deviations from the per-MIDI-note lookup
+        deviation_table = _midi_deviations(info)
+        deviations = [deviation_table[note] for note in notes]
+    else:
+        deviations = [abs(nearest_midi - note) for note, (_, nearest_midi, _)
+                      in zip(notes, map_notes_batch(notes, playable_table))]
     
-    for note in notes:
-        char, nearest_midi, _ = map_note_to_shawzin(note, playable_table)
-        deviation = abs(nearest_midi - note)
-        
-        if deviation <= max_deviation:
-            covered_notes += 1
-        
-        total_deviation += deviation
-        max_dev = max(max_dev, deviation)
+    covered_notes = sum(1 for deviation in deviations if deviation <= max_deviation)
+    total_deviation = sum(deviations)
+    max_dev = max(deviations)
     
     coverage = covered_notes / len(notes)
     avg_deviation = total_deviation / len(notes)
@@ -181,7 +323,7 @@ def find_best_scale_for_notes(notes: List[int],
     
     for scale_id in range(1, 10):
         try:
-            playable_table = build_playable_table(scale_id, octave_range)
+            playable_table = _shared_playable_table(scale_id, octave_range)
             analysis = analyze_note_coverage(notes, playable_table)
             
             # Score based on coverage and deviation
@@ -196,6 +338,33 @@ def find_best_scale_for_notes(notes: List[int],
     return best_scale
 
 
+def _map_note_events(events: List[Event],
+                     playable_table: List[Tuple[int, str]],
+                     maintain_consistency: bool = True) -> Tuple[List[Event], List[Tuple[str, int, int]]]:
+    """Select note events and map each one, returning (note_events, mappings)."""
+    note_events = [event for event in events
+                   if event.type == 'note' and event.note is not None]
+    
+    notes = [event.note for event in note_events]
+    
+    # Find best mappings for all notes in one batch
+    info = _table_info(playable_table)
+    if notes and info is not None and playable_table \
+            and min(notes) >= 0 and max(notes) <= 127:
+        # Built table: index a flat per-MIDI-note lookup instead of searching
+        lookup = _midi_lookup(info)
+        mappings = [lookup[note] for note in notes]
+    elif maintain_consistency:
+        # Cache for consistent mapping: each distinct MIDI note is mapped once
+        unique_notes = list(dict.fromkeys(notes))
+        mapping_cache = dict(zip(unique_notes, map_notes_batch(unique_notes, playable_table)))
+        mappings = [mapping_cache[note] for note in notes]
+    else:
+        mappings = map_notes_batch(notes, playable_table)
+    
+    return note_events, mappings
+
+
 def map_events_to_shawzin_events(events: List[Event],
                                 playable_table: List[Tuple[int, str]],
                                 prefer_top_string: bool = True,
@@ -213,28 +382,11 @@ def map_events_to_shawzin_events(events: List[Event],
         List of ShawzinNote objects
     """
     shawzin_notes = []
-    mapping_cache = {}  # Cache for consistent mapping
+    note_events, mappings = _map_note_events(events, playable_table, maintain_consistency)
     
-    for event in events:
-        if event.type != 'note':
-            continue
-            
-        if event.note is None:
-            continue
-            
+    for event, (char, mapped_midi, octave_shift) in zip(note_events, mappings):
         midi_note = event.note
         
-        # Check cache for consistency
-        if maintain_consistency and midi_note in mapping_cache:
-            char, mapped_midi, octave_shift = mapping_cache[midi_note]
-        else:
-            # Find best mapping
-            char, mapped_midi, octave_shift = map_note_to_shawzin(midi_note, playable_table)
-            
-            # Cache the mapping
-            if maintain_consistency:
-                mapping_cache[midi_note] = (char, mapped_midi, octave_shift)
-        
         # Create ShawzinNote
         shawzin_note = ShawzinNote(
             character=char,
@@ -251,6 +403,36 @@ def map_events_to_shawzin_events(events: List[Event],
     return shawzin_notes
 
 
+def map_events_to_shawzin_arrays(events: List[Event],
+                                 playable_table: List[Tuple[int, str]],
+                                 scale_id: int = 1,
+                                 maintain_consistency: bool = True) -> 'ShawzinNoteArrays':
+    """
+    Map note events straight into parallel arrays, without per-note objects.
+    
+    Args:
+        events: List of note events
+        playable_table: Playable mapping table
+        scale_id: Shawzin scale ID the table was built for
+        maintain_consistency: Cache mappings for same MIDI notes
+        
+    Returns:
+        ShawzinNoteArrays with one entry per mapped note
+    """
+    note_events, mappings = _map_note_events(events, playable_table, maintain_consistency)
+    
+    characters, mapped_midi, octave_shift = zip(*mappings) if mappings else ((), (), ())
+    return ShawzinNoteArrays(
+        characters=''.join(characters),
+        time_sec=array('d', [event.time_sec for event in note_events]),
+        duration_sec=array('d', [event.delta_sec for event in note_events]),  # Delta as duration
+        original_midi=array('h', [event.note for event in note_events]),
+        mapped_midi=array('h', mapped_midi),
+        octave_shift=array('h', octave_shift),
+        scale_id=scale_id
+    )
+
+
 class ShawzinMapper:
     """Advanced mapper with caching and optimization."""
     
@@ -359,7 +541,7 @@ def quick_map_single_note(midi_note: int,
     Returns:
         Tuple of (character, mapped_midi, octave_shift)
     """
-    playable_table = build_playable_table(scale_id, octave_range)
+    playable_table = _shared_playable_table(scale_id, octave_range)
     return map_note_to_shawzin(midi_note, playable_table)
 
 
@@ -377,7 +559,7 @@ def analyze_scale_compatibility(notes: List[int]) -> Dict[int, Dict[str, float]]
     
     for scale_id in range(1, 10):
         try:
-            playable_table = build_playable_table(scale_id)
+            playable_table = _shared_playable_table(scale_id)
             analysis = analyze_note_coverage(notes, playable_table)
             results[scale_id] = analysis
         except (ValueError, KeyError):
@@ -6,6 +6,7 @@ compared to original input, enabling comparison with other tools like Empyrrhus.
 """
 
 import math
+from bisect import bisect_left
 from typing import List, Dict, Any, Tuple, Optional
 from dataclasses import dataclass
 
@@ -13,7 +14,32 @@ from .midi_io import Event
 from .mapper import ShawzinNote
 
 
-@dataclass
+# Event types counted as input notes
+_NOTE_EVENT_TYPES = frozenset(('note', 'note_on'))
+
+# Mapping ratio targets per conversion mode; other modes use the default
+_MODE_TARGET_RATIOS = {"melody-only": 0.95}
+_DEFAULT_TARGET_RATIO = 0.90
+
+_REPORT_RULE = "=" * 50
+_ASSESSMENT_HEADER = ("", "QUALITY ASSESSMENT", "-" * 30)
+
+
+def _ratio_assessment(target_ratio: float) -> Tuple[float, float, str, str, str]:
+    """Build (target, good threshold, excellent/good/poor lines) for a mapping ratio target."""
+    good_ratio = target_ratio - 0.1
+    return (target_ratio, good_ratio,
+            f"✓ Mapping Ratio: EXCELLENT (≥{target_ratio:.2f})",
+            f"⚠ Mapping Ratio: GOOD (≥{good_ratio:.2f})",
+            f"✗ Mapping Ratio: POOR (<{good_ratio:.2f})")
+
+
+# Mapping ratio assessments, formatted once per mode
+_MODE_RATIO_ASSESSMENTS = {mode: _ratio_assessment(ratio) for mode, ratio in _MODE_TARGET_RATIOS.items()}
+_DEFAULT_RATIO_ASSESSMENT = _ratio_assessment(_DEFAULT_TARGET_RATIO)
+
+
+@dataclass(slots=True)
 class ConversionMetrics:
     """Container for conversion quality metrics."""
     mapped_ratio: float              # Percentage of notes successfully mapped (0.0-1.0)
@@ -43,7 +69,8 @@ def compute_mapping_metrics(original_events: List[Event],
         ConversionMetrics object with quality measurements
     """
     # Filter to note events only
-    note_events = [e for e in original_events if e.type in ['note', 'note_on'] and e.note is not None]
+    note_types = _NOTE_EVENT_TYPES
+    note_events = [e for e in original_events if e.type in note_types and e.note is not None]
     
     total_notes = len(note_events)
     mapped_notes = len(mapped_events)
@@ -64,33 +91,27 @@ def compute_mapping_metrics(original_events: List[Event],
     # Calculate mapping ratio
     mapped_ratio = mapped_notes / total_notes if total_notes > 0 else 0.0
     
-    # Calculate pitch deviations
-    pitch_errors = []
-    timing_errors = []
-    
     # Match original events to mapped events by time proximity
     matched_pairs = _match_events_by_time(note_events, mapped_events)
+    matched = [(original, mapped) for original, mapped in matched_pairs
+               if original is not None and mapped is not None]
     
-    for original, mapped in matched_pairs:
-        if original is not None and mapped is not None:
-            # Pitch deviation in semitones
-            original_pitch = original.note
-            mapped_pitch = mapped.mapped_midi
-            pitch_error = abs(mapped_pitch - original_pitch)
-            pitch_errors.append(pitch_error)
-            
-            # Timing deviation in beats
-            original_beats = _seconds_to_beats(original.time_sec, tempo_us_per_beat)
-            mapped_beats = _seconds_to_beats(mapped.time_sec, tempo_us_per_beat)
-            timing_error = abs(mapped_beats - original_beats)
-            timing_errors.append(timing_error)
+    # Pitch deviations in semitones, as one column over all matched pairs
+    pitch_errors = [abs(mapped.mapped_midi - original.note) for original, mapped in matched]
+    
+    # Timing deviations in beats (beat length is the same for every pair;
+    # dividing by it, as _seconds_to_beats does, keeps results identical)
+    beat_duration = tempo_us_per_beat / 1_000_000
+    timing_errors = [abs(mapped.time_sec / beat_duration - original.time_sec / beat_duration)
+                     for original, mapped in matched]
     
     # Calculate statistics
     avg_abs_semitone_error = sum(pitch_errors) / len(pitch_errors) if pitch_errors else 0.0
     max_pitch_error = max(pitch_errors) if pitch_errors else 0.0
     
     # RMS timing error
-    timing_rms = math.sqrt(sum(e**2 for e in timing_errors) / len(timing_errors)) if timing_errors else 0.0
+    timing_rms = math.sqrt(sum([error * error for error in timing_errors]) / len(timing_errors)) \
+        if timing_errors else 0.0
     
     return ConversionMetrics(
         mapped_ratio=mapped_ratio,
@@ -119,32 +140,43 @@ def _match_events_by_time(original_events: List[Event],
         List of (original, mapped) pairs, None for unmatched events
     """
     matched_pairs = []
-    used_mapped = set()
+    used_mapped = bytearray(len(mapped_events))
+    
+    # Mapped indices ordered by time (stable, so equal times keep index order)
+    order = sorted(range(len(mapped_events)), key=lambda idx: mapped_events[idx].time_sec)
+    times = [mapped_events[idx].time_sec for idx in order]
     
     for orig in original_events:
-        best_match = None
+        orig_time = orig.time_sec
         best_distance = float('inf')
         best_idx = -1
         
-        for idx, mapped in enumerate(mapped_events):
-            if idx in used_mapped:
-                continue
-                
-            time_distance = abs(orig.time_sec - mapped.time_sec)
-            if time_distance < time_tolerance and time_distance < best_distance:
-                best_match = mapped
-                best_distance = time_distance
-                best_idx = idx
+        # Only mapped events within tolerance can match: walk outwards from
+        # orig_time in both directions until the distance reaches it. The
+        # nearest unused event wins, lowest index first on equal distance.
+        position = bisect_left(times, orig_time)
+        for step, stop in ((-1, -1), (1, len(times))):
+            pos = position - 1 if step < 0 else position
+            while pos != stop:
+                time_distance = abs(orig_time - times[pos])
+                if not time_distance < time_tolerance:
+                    break
+                idx = order[pos]
+                if not used_mapped[idx] and (time_distance < best_distance or
+                                             (time_distance == best_distance and idx < best_idx)):
+                    best_distance = time_distance
+                    best_idx = idx
+                pos += step
         
-        if best_match is not None:
-            matched_pairs.append((orig, best_match))
-            used_mapped.add(best_idx)
+        if best_idx >= 0:
+            matched_pairs.append((orig, mapped_events[best_idx]))
+            used_mapped[best_idx] = 1
         else:
             matched_pairs.append((orig, None))  # Original note with no match
     
     # Add unmatched mapped events
     for idx, mapped in enumerate(mapped_events):
-        if idx not in used_mapped:
+        if not used_mapped[idx]:
             matched_pairs.append((None, mapped))  # Mapped note with no original
     
     return matched_pairs
@@ -170,39 +202,36 @@ def format_metrics_report(metrics: ConversionMetrics,
     Returns:
         Formatted report string
     """
-    report = []
-    report.append("CONVERSION QUALITY METRICS")
-    report.append("=" * 50)
-    
-    # Basic statistics
-    report.append(f"Total Input Notes:     {metrics.total_notes}")
-    report.append(f"Successfully Mapped:   {metrics.mapped_notes}")
-    report.append(f"Ignored Notes:         {metrics.ignored_notes}")
-    report.append("")
-    
-    # Quality metrics
-    report.append(f"Mapping Ratio:         {metrics.mapped_ratio:.3f} ({metrics.mapped_ratio*100:.1f}%)")
-    report.append(f"Avg Pitch Error:       {metrics.avg_abs_semitone_error:.2f} semitones")
-    report.append(f"Max Pitch Error:       {metrics.max_pitch_error:.2f} semitones")
-    report.append(f"Timing RMS Error:      {metrics.timing_rms:.3f} beats")
+    report = [
+        "CONVERSION QUALITY METRICS",
+        _REPORT_RULE,
+        
+        # Basic statistics
+        f"Total Input Notes:     {metrics.total_notes}",
+        f"Successfully Mapped:   {metrics.mapped_notes}",
+        f"Ignored Notes:         {metrics.ignored_notes}",
+        "",
+        
+        # Quality metrics
+        f"Mapping Ratio:         {metrics.mapped_ratio:.3f} ({metrics.mapped_ratio*100:.1f}%)",
+        f"Avg Pitch Error:       {metrics.avg_abs_semitone_error:.2f} semitones",
+        f"Max Pitch Error:       {metrics.max_pitch_error:.2f} semitones",
+        f"Timing RMS Error:      {metrics.timing_rms:.3f} beats",
+    ]
     
     if include_recommendations:
-        report.append("")
-        report.append("QUALITY ASSESSMENT")
-        report.append("-" * 30)
+        report.extend(_ASSESSMENT_HEADER)
         
         # Mapping ratio assessment
-        if mode == "melody-only":
-            target_ratio = 0.95
-        else:
-            target_ratio = 0.90
+        target_ratio, good_ratio, excellent_line, good_line, poor_line = \
+            _MODE_RATIO_ASSESSMENTS.get(mode, _DEFAULT_RATIO_ASSESSMENT)
             
         if metrics.mapped_ratio >= target_ratio:
-            report.append(f"✓ Mapping Ratio: EXCELLENT (≥{target_ratio:.2f})")
-        elif metrics.mapped_ratio >= target_ratio - 0.1:
-            report.append(f"⚠ Mapping Ratio: GOOD (≥{target_ratio-0.1:.2f})")
+            report.append(excellent_line)
+        elif metrics.mapped_ratio >= good_ratio:
+            report.append(good_line)
         else:
-            report.append(f"✗ Mapping Ratio: POOR (<{target_ratio-0.1:.2f})")
+            report.append(poor_line)
             report.append("  → Try chromatic scale (--scale-override 3)")
         
         # Pitch accuracy assessment
@@ -225,8 +254,7 @@ def format_metrics_report(metrics: ConversionMetrics,
         
         # Overall quality score
         quality_score = _compute_overall_quality(metrics, mode)
-        report.append("")
-        report.append(f"Overall Quality Score: {quality_score:.1f}/10")
+        report.extend(("", f"Overall Quality Score: {quality_score:.1f}/10"))
         
         if quality_score >= 8.0:
             report.append("🎵 Excellent conversion! Ready for Warframe.")
@@ -249,20 +277,27 @@ def _compute_overall_quality(metrics: ConversionMetrics, mode: str) -> float:
     Returns:
         Quality score from 0.0 to 10.0
     """
+    # Clamps are written as conditional expressions rather than min()/max()
+    # calls; they pick the same operand, NaN included.
+    
     # Mapping ratio score (40% weight)
-    target_ratio = 0.95 if mode == "melody-only" else 0.90
-    ratio_score = min(10.0, (metrics.mapped_ratio / target_ratio) * 10.0)
+    target_ratio = _MODE_TARGET_RATIOS.get(mode, _DEFAULT_TARGET_RATIO)
+    ratio_score = (metrics.mapped_ratio / target_ratio) * 10.0
+    ratio_score = ratio_score if ratio_score < 10.0 else 10.0
     
     # Pitch accuracy score (40% weight)
-    pitch_score = max(0.0, 10.0 - (metrics.avg_abs_semitone_error * 5.0))
+    pitch_score = 10.0 - (metrics.avg_abs_semitone_error * 5.0)
+    pitch_score = pitch_score if pitch_score > 0.0 else 0.0
     
     # Timing accuracy score (20% weight)
-    timing_score = max(0.0, 10.0 - (metrics.timing_rms * 20.0))
+    timing_score = 10.0 - (metrics.timing_rms * 20.0)
+    timing_score = timing_score if timing_score > 0.0 else 0.0
     
     # Weighted average
     overall_score = (ratio_score * 0.4) + (pitch_score * 0.4) + (timing_score * 0.2)
     
-    return min(10.0, max(0.0, overall_score))
+    overall_score = overall_score if overall_score > 0.0 else 0.0
+    return overall_score if overall_score < 10.0 else 10.0
 
 
 def analyze_conversion_bottlenecks(metrics: ConversionMetrics) -> List[str]:
@@ -17,12 +17,14 @@ Example:
     >>> compressed, refs = fold_repeats_into_refs(tokens)
 """
 
-from typing import List, Tuple, Dict, Set, Optional
+from array import array
+from typing import List, Tuple, Dict, Set, Optional, Sequence
 from dataclasses import dataclass
 from collections import defaultdict
+from operator import itemgetter
 
 
-@dataclass
+@dataclass(slots=True)
 class PatternMatch:
     """Represents a detected pattern match."""
     start_index: int
@@ -31,13 +33,57 @@ class PatternMatch:
     occurrences: List[int]  # List of start indices where pattern occurs
 
 
-@dataclass
+@dataclass(slots=True)
 class PatternReference:
     """Represents a reference to a pattern."""
     pattern_id: str
     original_tokens: List[str]
 
 
+# Polynomial rolling hash parameters: Mersenne prime modulus, prime base
+_HASH_MOD = (1 << 61) - 1
+_HASH_BASE = 1_000_003
+
+
+def _intern_tokens(tokens: List[str]) -> array:
+    """
+    Map each distinct token to a small integer ID (1, 2, ...) in first-seen order.
+    
+    IDs are packed in an array('i'): slices used as suffix sort keys and in
+    match comparisons are compact C buffers rather than lists of int objects.
+    """
+    token_ids = {}
+    return array('i', [token_ids.setdefault(token, len(token_ids) + 1) for token in tokens])
+
+
+def _prefix_hashes(ids: Sequence[int]) -> List[int]:
+    """Polynomial hashes of every prefix of ids; entry k hashes ids[:k]."""
+    mod = _HASH_MOD
+    base = _HASH_BASE
+    
+    prefix = [0]
+    append = prefix.append
+    hash_value = 0
+    for token_id in ids:
+        hash_value = (hash_value * base + token_id) % mod
+        append(hash_value)
+    
+    return prefix
+
+
+def _window_hashes(prefix: List[int], window_size: int) -> List[int]:
+    """
+    Rabin-Karp hash of every window of window_size IDs.
+    
+    Each window is derived from the shared prefix hashes in constant time,
+    hash(ids[i:i+w]) = prefix[i+w] - prefix[i] * BASE**w (mod MOD), so one
+    prefix table serves every window size.
+    """
+    mod = _HASH_MOD
+    shift = pow(_HASH_BASE, window_size, mod)
+    return [(end - start * shift) % mod for start, end in zip(prefix, prefix[window_size:])]
+
+
 def rolling_hash(tokens: List[str], window_size: int) -> List[int]:
     """
     Compute rolling hash for token sequences.
@@ -49,18 +95,108 @@ def rolling_hash(tokens: List[str], window_size: int) -> List[int]:
     Returns:
         List of hash values for each window position
     """
-    if window_size > len(tokens):
-        return []
+    return _window_hashes(_prefix_hashes(_intern_tokens(tokens)), window_size)
+
+
+def _token_positions(tokens: List[str]) -> Dict[str, List[int]]:
+    """Map each distinct token to the ascending list of indices where it occurs."""
+    positions = defaultdict(list)
+    for i, token in enumerate(tokens):
+        positions[token].append(i)
+    return positions
+
+
+def _find_pattern_occurrences(tokens: List[str], pattern: List[str],
+                              positions: Optional[Dict[str, List[int]]] = None) -> List[int]:
+    """
+    Find every start index where pattern occurs in tokens, overlaps included.
+    
+    Candidate positions are found by jumping between occurrences of the
+    pattern's first token with list.index; only those are compared in full.
+    When a positions index from _token_positions is given, the candidates are
+    read from it instead, so many patterns can share a single scan of tokens.
+    """
+    length = len(pattern)
+    last_start = len(tokens) - length
+    if not length:
+        return list(range(last_start + 1))
+    
+    first = pattern[0]
+    if positions is not None:
+        return [i for i in positions.get(first, ())
+                if i <= last_start and tokens[i:i + length] == pattern]
+    
+    occurrences = []
+    i = 0
+    while True:
+        try:
+            i = tokens.index(first, i, last_start + 1)
+        except ValueError:
+            break
+        if tokens[i:i + length] == pattern:
+            occurrences.append(i)
+        i += 1
+    
+    return occurrences
+
+
+def _common_prefix_length(ids: Sequence[int], a: int, b: int, limit: int) -> int:
+    """Length of the common prefix of ids[a:] and ids[b:], capped at limit."""
+    # Binary search on slice equality: O(log limit) C-level comparisons
+    low, high = 0, min(limit, len(ids) - a, len(ids) - b)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if ids[a:a + mid] == ids[b:b + mid]:
+            low = mid
+        else:
+            high = mid - 1
+    return low
+
+
+def _repeat_groups_by_length(ids: Sequence[int], min_len: int, 
+                             max_len: int) -> Dict[int, List[List[int]]]:
+    """
+    Group repeated windows by content for every length in [min_len, max_len].
     
-    hashes = []
-    for i in range(len(tokens) - window_size + 1):
-        window = tokens[i:i + window_size]
-        # Create hash from concatenated tokens
-        content = ''.join(window)
-        hash_value = hash(content)
-        hashes.append(hash_value)
+    Builds a suffix array over the token IDs (suffixes compared on their
+    first max_len IDs) and its LCP array, then walks the LCP intervals once
+    with a stack. An interval whose suffixes share v IDs, inside a parent
+    sharing p, is the group of identical windows for every length in (p, v].
     
-    return hashes
+    Returns:
+        Dictionary mapping length to its groups. Only windows occurring at
+        least twice are included; groups are ordered by first occurrence
+        and hold start positions in ascending order.
+    """
+    n = len(ids)
+    groups_by_length = defaultdict(list)
+    if n < 2 or max_len < min_len:
+        return groups_by_length
+    
+    suffixes = sorted(range(n), key=lambda i: ids[i:i + max_len])
+    lcp = [0] * (n + 1)
+    for k in range(1, n):
+        lcp[k] = _common_prefix_length(ids, suffixes[k - 1], suffixes[k], max_len)
+    
+    # Stack of open intervals: (shared length, left boundary in suffixes)
+    stack = [(0, 0)]
+    for k in range(1, n + 1):
+        current = lcp[k]
+        left = k - 1
+        while current < stack[-1][0]:
+            shared, left = stack.pop()
+            parent_shared = max(current, stack[-1][0])
+            low = max(parent_shared + 1, min_len)
+            if low <= shared:
+                members = sorted(suffixes[left:k])
+                for length in range(low, shared + 1):
+                    groups_by_length[length].append(members)
+        if current > stack[-1][0]:
+            stack.append((current, left))
+    
+    for groups in groups_by_length.values():
+        groups.sort(key=itemgetter(0))
+    return groups_by_length
 
 
 def find_repeating_sequences(tokens: List[str], 
@@ -85,41 +221,57 @@ def find_repeating_sequences(tokens: List[str],
     # Try different pattern lengths, starting from longest
     max_len = min(len(tokens) // min_occurrences, 50)
     
+    # Empty patterns can neither be matched nor replaced, so start at length 1
+    min_len = max(min_len, 1)
+    
+    # Intern tokens once; every pattern length works on the same ID list
+    ids = _intern_tokens(tokens)
+    
+    # Windows seen only once can matter only when a single occurrence counts
+    # as a pattern. Otherwise enumerate the repeated windows of every length
+    # up front from the suffix array instead of hashing all windows per length.
+    if min_occurrences >= 2:
+        repeat_groups = _repeat_groups_by_length(ids, min_len, max_len)
+    else:
+        repeat_groups = None
+        prefix = _prefix_hashes(ids)
+    
+    # Positions already claimed by an occurrence of an accepted pattern
+    covered = bytearray(len(tokens))
+    
     for pattern_len in range(max_len, min_len - 1, -1):
-        # Get rolling hashes for this pattern length
-        hashes = rolling_hash(tokens, pattern_len)
+        if repeat_groups is not None:
+            groups = repeat_groups.get(pattern_len, ())
+        else:
+            # Group rolling hashes of this pattern length to find potential matches
+            hash_groups = defaultdict(list)
+            for i, hash_val in enumerate(_window_hashes(prefix, pattern_len)):
+                hash_groups[hash_val].append(i)
+            groups = hash_groups.values()
         
-        # Group by hash value to find potential matches
-        hash_groups = defaultdict(list)
-        for i, hash_val in enumerate(hashes):
-            hash_groups[hash_val].append(i)
+        # Suffix-array groups are exact repeats; hash groups may hold collisions
+        verify = repeat_groups is None
         
         # Check each group for actual pattern matches
-        for hash_val, indices in hash_groups.items():
+        for indices in groups:
             if len(indices) >= min_occurrences:
-                # Verify that sequences are actually identical (not just hash collision)
-                base_pattern = tokens[indices[0]:indices[0] + pattern_len]
+                # Verify on the interned IDs: array slices compare as raw
+                # memory instead of string by string
+                base_pattern = ids[indices[0]:indices[0] + pattern_len]
                 confirmed_indices = [indices[0]]
                 
                 for idx in indices[1:]:
-                    candidate = tokens[idx:idx + pattern_len]
-                    if candidate == base_pattern:
-                        # Check for overlap with already found patterns
-                        overlaps = False
-                        for existing_start_indices, existing_len in patterns:
-                            for existing_idx in existing_start_indices:
-                                if (idx < existing_idx + existing_len and 
-                                    idx + pattern_len > existing_idx):
-                                    overlaps = True
-                                    break
-                            if overlaps:
-                                break
-                        
-                        if not overlaps:
-                            confirmed_indices.append(idx)
+                    # Skip candidates overlapping an already found pattern
+                    if covered.find(1, idx, idx + pattern_len) != -1:
+                        continue
+                    if not verify or ids[idx:idx + pattern_len] == base_pattern:
+                        confirmed_indices.append(idx)
                 
                 if len(confirmed_indices) >= min_occurrences:
                     patterns.append((confirmed_indices, pattern_len))
+                    occupied = b'\x01' * pattern_len
+                    for idx in confirmed_indices:
+                        covered[idx:idx + pattern_len] = occupied
     
     # Sort by potential savings (length * occurrences)
     patterns.sort(key=lambda p: p[1] * len(p[0]), reverse=True)
@@ -153,7 +305,13 @@ def fold_repeats_into_refs(tokens: List[str],
     
     # Create pattern references
     patterns_dict = {}
-    compressed = tokens.copy()
+    
+    # Original positions already replaced by an earlier (more valuable) pattern
+    covered = bytearray(len(tokens))
+    replacements = []  # (start, length, ref_token) in original token positions
+    
+    # Index token positions once; every pattern draws its candidates from it
+    positions = _token_positions(tokens)
     
     # Apply replacements greedily (largest savings first)
     pattern_id = 1
@@ -161,30 +319,40 @@ def fold_repeats_into_refs(tokens: List[str],
     for start_indices, length in patterns:
         # Get the pattern tokens
         pattern_tokens = tokens[start_indices[0]:start_indices[0] + length]
-        current_pattern_id = f"P{pattern_id}"
         
-        # Check if this pattern is still beneficial after previous replacements
+        # Occurrences still intact after previous replacements, taken left to
+        # right without overlapping each other
         current_occurrences = []
-        
-        # Find current occurrences in compressed tokens
-        for i in range(len(compressed) - length + 1):
-            if compressed[i:i + length] == pattern_tokens:
-                current_occurrences.append(i)
+        next_free = 0
+        for idx in _find_pattern_occurrences(tokens, pattern_tokens, positions):
+            if idx >= next_free and covered.find(1, idx, idx + length) == -1:
+                current_occurrences.append(idx)
+                next_free = idx + length
         
         # Apply replacement if still beneficial
         if len(current_occurrences) >= min_occurrences:
-            # Replace from right to left to maintain indices
-            current_occurrences.sort(reverse=True)
+            current_pattern_id = f"P{pattern_id}"
+            ref_token = f"@{current_pattern_id}"
+            occupied = b'\x01' * length
             
             for idx in current_occurrences:
-                # Replace pattern with reference token
-                ref_token = f"@{current_pattern_id}"
-                compressed[idx:idx + length] = [ref_token]
+                covered[idx:idx + length] = occupied
+                replacements.append((idx, length, ref_token))
             
             # Store pattern in dictionary
             patterns_dict[current_pattern_id] = pattern_tokens
             pattern_id += 1
     
+    # Build the output in one pass instead of splicing the list per occurrence
+    replacements.sort()
+    compressed = []
+    position = 0
+    for start, length, ref_token in replacements:
+        compressed += tokens[position:start]
+        compressed.append(ref_token)
+        position = start + length
+    compressed += tokens[position:]
+    
     return compressed, patterns_dict
 
 
@@ -200,13 +368,16 @@ def expand_pattern_refs(compressed_tokens: List[str],
     Returns:
         Expanded token list
     """
+    # Key the patterns by their full '@ID' reference token so each token
+    # needs a single dict lookup
+    refs = {f"@{pattern_id}": pattern for pattern_id, pattern in patterns_dict.items()}
     expanded = []
     
     for token in compressed_tokens:
-        if token.startswith('@') and token[1:] in patterns_dict:
+        pattern = refs.get(token)
+        if pattern is not None:
             # Expand pattern reference
-            pattern_id = token[1:]
-            expanded.extend(patterns_dict[pattern_id])
+            expanded.extend(pattern)
         else:
             # Regular token
             expanded.append(token)
@@ -380,14 +551,14 @@ def detect_song_structure(tokens: List[str],
         'outros': []
     }
     
+    # Simple heuristic: longer patterns are more likely to be choruses
+    chorus_length = min_section_length * 2
+    add_chorus = structure['choruses'].extend
+    add_verse = structure['verses'].extend
+    
     # Classify patterns by characteristics
     for start_indices, length in patterns:
-        positions = [(idx, idx + length) for idx in start_indices]
-        
-        # Simple heuristic: longer patterns are more likely to be choruses
-        if length >= min_section_length * 2:
-            structure['choruses'].extend(positions)
-        else:
-            structure['verses'].extend(positions)
+        add = add_chorus if length >= chorus_length else add_verse
+        add([(idx, idx + length) for idx in start_indices])
     
     return structure
@@ -6,7 +6,9 @@ Supports various subdivisions, quantization modes, and humanization options.
 """
 
 import random
-from typing import List, Literal, Optional, Tuple
+from collections import Counter
+from operator import attrgetter
+from typing import Iterable, List, Literal, Optional, Sequence, Tuple
 from dataclasses import dataclass, replace
 from .midi_io import Event
 
@@ -96,10 +98,72 @@ def add_humanization(time_sec: float, humanize_ms: Optional[float]) -> float:
     return max(0.0, time_sec + jitter_sec)  # Ensure non-negative time
 
 
+def _with_timing(event: Event, time_sec: float, delta_sec: float) -> Event:
+    """
+    Copy an event with new timing, leaving the original untouched.
+    
+    Plain Events are rebuilt positionally (in field order), several times
+    faster than dataclasses.replace; subclasses still go through replace.
+    """
+    if type(event) is Event:
+        return Event(event.type, event.note, time_sec, delta_sec, event.velocity, event.channel,
+                     event.track_index, event.tempo, event.numerator, event.denominator)
+    return replace(event, time_sec=time_sec, delta_sec=delta_sec)
+
+
+def quantize_times(times: Iterable[float],
+                   tempo_us_per_beat: int,
+                   settings: Optional[QuantizeSettings] = None,
+                   rng: Optional[random.Random] = None) -> List[float]:
+    """
+    Quantize a column of event times to a rhythmic grid.
+    
+    Works on plain time columns, e.g. a list or array('d') of seconds, so
+    callers holding times column-wise need not build Event objects. The
+    result keeps the input order and is not sorted.
+    
+    Args:
+        times: Event times in seconds
+        tempo_us_per_beat: Tempo in microseconds per beat
+        settings: Quantization settings (defaults applied if None)
+        rng: Random generator for humanization (module-level random if None)
+        
+    Returns:
+        List of quantized (and optionally humanized) times in seconds
+    """
+    if settings is None:
+        settings = QuantizeSettings()
+    
+    # Same arithmetic as seconds_to_beats -> quantize_beat_to_grid ->
+    # beats_to_seconds -> add_humanization, with the per-call constants
+    # hoisted and the whole time column computed in one pass
+    seconds_per_beat = tempo_us_per_beat / 1_000_000.0
+    beats_per_subdivision = 4.0 / settings.subdivision
+    to_grid = int if settings.mode == 'floor' else round
+    
+    quantized_times = [to_grid(time_sec / seconds_per_beat / beats_per_subdivision)
+                       * beats_per_subdivision * seconds_per_beat
+                       for time_sec in times]
+    
+    # Apply humanization if requested (one draw per time, in input order)
+    humanize_ms = settings.humanize_ms
+    if not (humanize_ms is None or humanize_ms <= 0):
+        # Inlined Random.uniform(-humanize_ms, humanize_ms): same draws, same
+        # arithmetic, without a Python-level call per time
+        draw = (rng or random).random
+        low, span = -humanize_ms, humanize_ms - -humanize_ms
+        for i, time_sec in enumerate(quantized_times):
+            time_sec += (low + span * draw()) / 1000.0
+            quantized_times[i] = time_sec if time_sec > 0.0 else 0.0  # Ensure non-negative time
+    
+    return quantized_times
+
+
 def quantize_events(events: List[Event], 
                    ticks_per_beat: int, 
                    tempo_us_per_beat: int,
-                   settings: Optional[QuantizeSettings] = None) -> List[Event]:
+                   settings: Optional[QuantizeSettings] = None,
+                   rng: Optional[random.Random] = None) -> List[Event]:
     """
     Quantize events to a rhythmic grid.
     
@@ -108,6 +172,7 @@ def quantize_events(events: List[Event],
         ticks_per_beat: MIDI ticks per beat
         tempo_us_per_beat: Tempo in microseconds per beat
         settings: Quantization settings (defaults applied if None)
+        rng: Random generator for humanization (module-level random if None)
         
     Returns:
         List of quantized events with updated timing
@@ -118,38 +183,23 @@ def quantize_events(events: List[Event],
     if settings is None:
         settings = QuantizeSettings()
     
-    quantized_events = []
+    quantized_times = quantize_times(map(attrgetter('time_sec'), events), tempo_us_per_beat, settings, rng)
     
-    for event in events:
-        # Convert seconds to beats
-        beat_time = seconds_to_beats(event.time_sec, tempo_us_per_beat)
-        
-        # Quantize to grid
-        quantized_beat = quantize_beat_to_grid(beat_time, settings.subdivision, settings.mode)
-        
-        # Convert back to seconds
-        quantized_seconds = beats_to_seconds(quantized_beat, tempo_us_per_beat)
-        
-        # Apply humanization if requested
-        final_time = add_humanization(quantized_seconds, settings.humanize_ms)
-        
-        # Create quantized event
-        quantized_event = replace(event, time_sec=final_time)
-        quantized_events.append(quantized_event)
+    # Sort by time to ensure proper ordering (stable, like sorting the events)
+    order = sorted(range(len(events)), key=quantized_times.__getitem__)
+    sorted_times = [quantized_times[i] for i in order]
     
-    # Sort by time to ensure proper ordering
-    quantized_events.sort(key=lambda e: e.time_sec)
+    sorted_events = [events[i] for i in order]
     
-    # Recalculate delta times if preserve_timing is enabled
+    # Recalculate delta times if preserve_timing is enabled; each event is
+    # copied once with both fields instead of once per field
     if settings.preserve_timing:
-        for i in range(len(quantized_events)):
-            if i == 0:
-                quantized_events[i] = replace(quantized_events[i], delta_sec=quantized_events[i].time_sec)
-            else:
-                delta = quantized_events[i].time_sec - quantized_events[i-1].time_sec
-                quantized_events[i] = replace(quantized_events[i], delta_sec=delta)
-    
-    return quantized_events
+        deltas = [sorted_times[0]]
+        deltas += [time_sec - previous for previous, time_sec in zip(sorted_times, sorted_times[1:])]
+    else:
+        deltas = [event.delta_sec for event in sorted_events]
+    
+    return list(map(_with_timing, sorted_events, sorted_times, deltas))
 
 
 def detect_tempo_from_events(events: List[Event], min_tempo: float = 60.0, max_tempo: float = 200.0) -> float:
@@ -164,29 +214,48 @@ def detect_tempo_from_events(events: List[Event], min_tempo: float = 60.0, max_t
     Returns:
         Estimated tempo in BPM
     """
-    if len(events) < 2:
+    return detect_tempo_from_times([event.time_sec for event in events], min_tempo, max_tempo)
+
+
+def detect_tempo_from_times(times: Sequence[float], min_tempo: float = 60.0, max_tempo: float = 200.0) -> float:
+    """
+    Detect likely tempo from a column of event times.
+    
+    Args:
+        times: Event times in seconds, in event order
+        min_tempo: Minimum reasonable tempo (BPM)
+        max_tempo: Maximum reasonable tempo (BPM)
+        
+    Returns:
+        Estimated tempo in BPM
+    """
+    if len(times) < 2:
         return 120.0  # Default tempo
     
-    # Calculate intervals between consecutive events
-    intervals = []
-    for i in range(1, len(events)):
-        interval = events[i].time_sec - events[i-1].time_sec
+    # Calculate intervals between consecutive events, binned to 10ms
+    # precision as integer centiseconds. round(interval * 100) equals
+    # round(interval, 2) * 100 unless the product lands exactly on a half,
+    # where the decimal rounding is redone.
+    centiseconds = []
+    append = centiseconds.append
+    for previous, time_sec in zip(times, times[1:]):
+        interval = time_sec - previous
         if interval > 0.05:  # Ignore very short intervals (< 50ms)
-            intervals.append(interval)
+            scaled = interval * 100
+            bin_index = round(scaled)
+            if abs(scaled - bin_index) == 0.5:
+                bin_index = round(round(interval, 2) * 100)
+            append(bin_index)
     
-    if not intervals:
+    if not centiseconds:
         return 120.0
     
     # Find the most common interval (likely beat duration)
     # Use histogram approach for robustness
-    from collections import Counter
-    
-    # Round intervals to 10ms precision for grouping
-    rounded_intervals = [round(interval, 2) for interval in intervals]
-    interval_counts = Counter(rounded_intervals)
+    interval_counts = Counter(centiseconds)
     
     # Get most common interval
-    most_common_interval = interval_counts.most_common(1)[0][0]
+    most_common_interval = interval_counts.most_common(1)[0][0] / 100
     
     # Convert to BPM (assuming most common interval is quarter note)
     estimated_bpm = 60.0 / most_common_interval
@@ -200,10 +269,12 @@ def detect_tempo_from_events(events: List[Event], min_tempo: float = 60.0, max_t
 class Quantizer:
     """Quantizer class for processing musical events."""
     
-    def __init__(self, settings: Optional[QuantizeSettings] = None):
-        """Initialize quantizer with settings."""
+    def __init__(self, settings: Optional[QuantizeSettings] = None, seed: Optional[int] = None):
+        """Initialize quantizer with settings and an optional humanization seed."""
         self.settings = settings or QuantizeSettings()
         self.last_tempo = 120.0  # Default tempo in BPM
+        # Seeded quantizers keep one generator across calls for reproducible jitter
+        self.rng = random.Random(seed) if seed is not None else None
     
     def quantize(self, events: List[Event], 
                 tempo_bpm: Optional[float] = None,
@@ -231,7 +302,7 @@ class Quantizer:
         # Convert BPM to microseconds per beat
         tempo_us_per_beat = int(60_000_000 / tempo_bpm)
         
-        return quantize_events(events, ticks_per_beat, tempo_us_per_beat, self.settings)
+        return quantize_events(events, ticks_per_beat, tempo_us_per_beat, self.settings, self.rng)
     
     def get_grid_positions(self, duration_beats: float = 4.0) -> List[float]:
         """
@@ -10,7 +10,10 @@ Usage:
 """
 
 import json
-from typing import Dict, List, Tuple, Optional
+import os
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, Tuple, Optional, Sequence
 from pathlib import Path
 
 # Base64 characters used for time encoding in Shawzin format
@@ -23,6 +26,11 @@ base64_chars = [
     "0", "1", "2", "3", "4", "5", "6", "7", "8", "9", "+", "/"
 ]
 
+# Same alphabet as a single string (for char indexing) and as ASCII bytes
+# (for integer indexing and building lookup tables)
+BASE64_STR = ''.join(base64_chars)
+BASE64_BYTES = BASE64_STR.encode('ascii')
+
 # Scale modulo values for different Shawzin scale types
 # These determine the range and mapping behavior for each scale
 scaleModulo = [36, 36, 12, 24, 36, 24, 36, 36, 36]
@@ -32,7 +40,7 @@ scaleModulo = [36, 36, 12, 24, 36, 24, 36, 36, 36]
 # String 1: B(no) J(sky) R(earth) Z(sky+earth) h(water) p(sky+water) x(earth+water) 5(all)
 # String 2: C(no) K(sky) S(earth) a(sky+earth) i(water) q(sky+water) y(earth+water) 6(all)  
 # String 3: E(no) M(sky) U(earth) c(sky+earth) k(water) s(sky+water) 0(earth+water) 8(all)
-scaleDict = {
+_SCALE_DICT = {
     # Scale 1: Pentatonic (36 notes) - Using Warframe standard chars
     1: {
         0: "B", 1: "C", 2: "E", 3: "J", 4: "K", 5: "M", 6: "R", 7: "S",
@@ -108,40 +116,87 @@ scaleDict = {
     }
 }
 
+# Flat lookup table of the default scales: SHAWZIN_LUT[scale_id - 1] is a tuple
+# with one entry per index below the scale's modulo (None where the scale has
+# no character), so lookups are tuple indexing instead of nested dict probes.
+# Scales with identical tables share a single tuple object.
+_shared_rows: Dict[Tuple[Optional[str], ...], Tuple[Optional[str], ...]] = {}
+SHAWZIN_LUT = tuple(
+    _shared_rows.setdefault(row, row)
+    for row in (
+        tuple(_SCALE_DICT[scale_id].get(index) for index in range(scaleModulo[scale_id - 1]))
+        for scale_id in range(1, len(scaleModulo) + 1)
+    )
+)
+del _shared_rows
+_SCALE_TABLES = dict(enumerate(SHAWZIN_LUT, start=1))
+
 # Basic chord dictionary for chord detection
-# Maps chord types to semitone intervals from root
-chordDict = {
+# Maps chord types to semitone intervals from root (immutable, hashable tuples)
+_CHORD_DICT = {
     # Basic triads
-    "major": [0, 4, 7],
-    "minor": [0, 3, 7],
-    "diminished": [0, 3, 6],
-    "augmented": [0, 4, 8],
+    "major": (0, 4, 7),
+    "minor": (0, 3, 7),
+    "diminished": (0, 3, 6),
+    "augmented": (0, 4, 8),
     
     # Suspended chords
-    "sus2": [0, 2, 7],
-    "sus4": [0, 5, 7],
+    "sus2": (0, 2, 7),
+    "sus4": (0, 5, 7),
     
     # Seventh chords
-    "major7": [0, 4, 7, 11],
-    "minor7": [0, 3, 7, 10],
-    "dominant7": [0, 4, 7, 10],
-    "diminished7": [0, 3, 6, 9],
-    "half_diminished7": [0, 3, 6, 10],
+    "major7": (0, 4, 7, 11),
+    "minor7": (0, 3, 7, 10),
+    "dominant7": (0, 4, 7, 10),
+    "diminished7": (0, 3, 6, 9),
+    "half_diminished7": (0, 3, 6, 10),
     
     # Extended chords
-    "major9": [0, 4, 7, 11, 14],
-    "minor9": [0, 3, 7, 10, 14],
-    "dominant9": [0, 4, 7, 10, 14],
+    "major9": (0, 4, 7, 11, 14),
+    "minor9": (0, 3, 7, 10, 14),
+    "dominant9": (0, 4, 7, 10, 14),
     
     # Power chords
-    "power": [0, 7],
-    "power_octave": [0, 7, 12],
+    "power": (0, 7),
+    "power_octave": (0, 7, 12),
 }
 
+# Exported defaults are read-only views: the lookup tables above and the
+# caches elsewhere are built from them once, so in-place edits would be
+# silently ignored. Loaders hand out copies instead.
+scaleDict = MappingProxyType({scale_id: MappingProxyType(mapping)
+                              for scale_id, mapping in _SCALE_DICT.items()})
+chordDict = MappingProxyType(_CHORD_DICT)
+
+def _default_scales() -> Dict[int, Dict[int, str]]:
+    """Modifiable copy of the default scale mappings."""
+    return {scale_id: dict(mapping) for scale_id, mapping in _SCALE_DICT.items()}
+
+@lru_cache(maxsize=16)
+def _read_json(json_path: str, mtime_ns: int, size: int) -> Any:
+    """Parse a JSON file, keyed like midi_io._read_merged_notes; callers must not mutate."""
+    with open(json_path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def _load_json(json_path: str) -> Any:
+    """Parse a JSON file, reusing the previous parse while the file is unchanged."""
+    stat = os.stat(json_path)
+    return _read_json(json_path, stat.st_mtime_ns, stat.st_size)
+
+@lru_cache(maxsize=16)
+def _read_scales(json_path: str, mtime_ns: int, size: int) -> Dict[int, Dict[int, str]]:
+    """Scale mappings with integer keys, memoized per file version; callers must copy."""
+    data = _read_json(json_path, mtime_ns, size)
+    return {int(scale_id): {int(k): v for k, v in mapping.items()}
+            for scale_id, mapping in data.items()}
+
 def load_scale_from_json(json_path: str) -> Dict[int, Dict[int, str]]:
     """
     Load scale mappings from JSON file.
     
+    Repeated loads of an unchanged file reuse the parsed JSON; each call
+    still returns new dictionaries.
+    
     Args:
         json_path: Path to JSON file containing scale mappings
         
@@ -159,26 +214,26 @@ def load_scale_from_json(json_path: str) -> Dict[int, Dict[int, str]]:
     }
     """
     try:
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        stat = os.stat(json_path)
+        scales = _read_scales(json_path, stat.st_mtime_ns, stat.st_size)
         
-        # Convert string keys to integers
-        result = {}
-        for scale_id, mapping in data.items():
-            result[int(scale_id)] = {int(k): v for k, v in mapping.items()}
-        
-        return result
+        # String keys were converted to integers once per file version; copying
+        # the int-keyed dicts reuses their stored hashes
+        return {scale_id: dict(mapping) for scale_id, mapping in scales.items()}
     except FileNotFoundError:
         print(f"Warning: Scale mapping file not found: {json_path}")
-        return scaleDict
+        return _default_scales()
     except json.JSONDecodeError as e:
         print(f"Warning: Invalid JSON in scale mapping file: {e}")
-        return scaleDict
+        return _default_scales()
 
-def load_chord_dict(json_path: str) -> Dict[str, List[int]]:
+def load_chord_dict(json_path: str) -> Dict[str, Sequence[int]]:
     """
     Load chord dictionary from JSON file.
     
+    Repeated loads of an unchanged file reuse the parsed JSON; each call
+    still returns a new dictionary, with patterns as tuples.
+    
     Args:
         json_path: Path to JSON file containing chord definitions
         
@@ -193,14 +248,16 @@ def load_chord_dict(json_path: str) -> Dict[str, List[int]]:
     }
     """
     try:
-        with open(json_path, 'r', encoding='utf-8') as f:
-            return json.load(f)
+        # Patterns come back as tuples, like chordDict's, so the cached parse
+        # is never shared in mutable form
+        return {name: tuple(pattern) if isinstance(pattern, list) else pattern
+                for name, pattern in _load_json(json_path).items()}
     except FileNotFoundError:
         print(f"Warning: Chord dictionary file not found: {json_path}")
-        return chordDict
+        return dict(_CHORD_DICT)
     except json.JSONDecodeError as e:
         print(f"Warning: Invalid JSON in chord dictionary file: {e}")
-        return chordDict
+        return dict(_CHORD_DICT)
 
 # Utility functions for note conversion
 def midi_to_pitch_class(midi_note: int) -> int:
@@ -218,19 +275,39 @@ def get_shawzin_char(scale_id: int, note_index: int) -> Optional[str]:
     Returns:
         Shawzin character or None if invalid
     """
-    if scale_id not in scaleDict:
+    scale_chars = _SCALE_TABLES.get(scale_id)
+    if scale_chars is None:
         return None
     
-    scale_mapping = scaleDict[scale_id]
-    modulo = scaleModulo[scale_id - 1]  # scaleModulo is 0-indexed
+    # Apply modulo to handle note wrapping (each table is modulo entries long)
+    return scale_chars[note_index % len(scale_chars)]
+
+def get_scale_lut(scale_id: int) -> Tuple[Optional[str], ...]:
+    """
+    Get the flat character table of a scale for lookups in hot loops.
+    
+    Bind the table once and index it with note_index % len(table) instead of
+    calling get_shawzin_char per note; the table length is the scale's modulo.
     
-    # Apply modulo to handle note wrapping
-    wrapped_index = note_index % modulo
-    return scale_mapping.get(wrapped_index)
+    Args:
+        scale_id: Shawzin scale ID (1-9)
+        
+    Returns:
+        Tuple of Shawzin characters indexed by note index (None where unmapped)
+    """
+    scale_chars = _SCALE_TABLES.get(scale_id)
+    if scale_chars is None:
+        raise ValueError(f"Invalid scale_id: {scale_id}")
+    return scale_chars
 
 # Pitch class names for debugging
 PITCH_CLASS_NAMES = ["C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B"]
 
+# Pitch class and name of every MIDI note (0-127); hot loops over MIDI notes
+# can index these instead of calling the helpers or computing note % 12
+PC_OF_MIDI = tuple(midi_note % 12 for midi_note in range(128))
+NAME_OF_MIDI = tuple(PITCH_CLASS_NAMES[pitch_class] for pitch_class in PC_OF_MIDI)
+
 def pitch_class_to_name(pitch_class: int) -> str:
     """Convert pitch class number to note name."""
     return PITCH_CLASS_NAMES[pitch_class % 12]
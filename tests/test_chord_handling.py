@@ -10,6 +10,7 @@ from midi2shawzin.chord_handling import (
     ChordProcessor,
     group_simultaneous,
     analyze_chord_structure,
+    identify_chord,
     reduce_chord,
     create_arpeggio_events,
     map_chord_to_shawzin,
@@ -99,6 +100,16 @@ class TestChordHandling:
         assert 'third' not in analysis
         assert 'fifth' not in analysis
     
+    def test_identify_chord(self):
+        """Test chord identification by pitch-class set."""
+        assert identify_chord([60, 64, 67]) == 'major'
+        assert identify_chord([67, 60, 63]) == 'minor'
+        assert identify_chord([60, 64, 67, 71]) == 'major7'
+        assert identify_chord([48, 64, 79]) == 'major'      # Spread voicing
+        assert identify_chord([60, 67, 72]) == 'power'      # Octave folds onto power
+        assert identify_chord([60]) is None
+        assert identify_chord([]) is None
+    
     def test_reduce_chord_basic(self):
         """Test basic chord reduction."""
         # 4-note chord that should be reduced to 3
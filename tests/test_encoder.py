@@ -17,7 +17,7 @@ from midi2shawzin.encoder import (
     quick_encode_token, analyze_timing_accuracy
 )
 from midi2shawzin.mapper import ShawzinNote
-from midi2shawzin.shawzin_mapping import base64_chars
+from midi2shawzin.shawzin_mapping import base64_chars, BASE64_STR
 
 
 class TestTimeEncoding:
@@ -94,6 +94,17 @@ class TestTimeEncoding:
         # Invalid characters
         with pytest.raises(ValueError):
             shawzin_time_to_seconds("!@")
+        
+        with pytest.raises(ValueError):
+            shawzin_time_to_seconds("A\u00e9")
+    
+    def test_shawzin_time_to_seconds_custom_alphabet(self):
+        """Test decoding with a caller-supplied alphabet."""
+        alphabet = list(reversed(base64_chars))
+        
+        assert shawzin_time_to_seconds(alphabet[0] + alphabet[1], base64_chars=alphabet) == 0.0625
+        with pytest.raises(ValueError):
+            shawzin_time_to_seconds("!@", base64_chars=alphabet)
 
 
 class TestTokenEncoding:
@@ -265,6 +276,19 @@ class TestFileIO:
                 content = f.read()
                 assert content == chunks[1]
     
+    def test_write_shawzin_file_line_chunks(self):
+        """Test that chunks given as line lists are written newline-separated."""
+        chunks = [["2", "1AA2BB3CC"], "2\nqDDeEEaFF"]
+        
+        with tempfile.TemporaryDirectory() as temp_dir:
+            output_path = os.path.join(temp_dir, "test")
+            written_files = write_shawzin_file(output_path, chunks, mode='full')
+            
+            with open(written_files[0], 'r') as f:
+                assert f.read() == "2\n1AA2BB3CC"
+            with open(written_files[1], 'r') as f:
+                assert f.read() == chunks[1]
+    
     def test_read_shawzin_file_basic(self):
         """Test reading Shawzin file."""
         content = "2\n1AA2BB3CC"
@@ -302,6 +326,49 @@ class TestFileIO:
         
         finally:
             os.unlink(temp_path)
+    
+    def test_read_shawzin_file_accumulates_times(self):
+        """Test decoded times are cumulative and trailing partial tokens ignored."""
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
+            f.write("2BAB CAA\nEBAx")
+            temp_path = f.name
+        
+        try:
+            scale_id, notes = read_shawzin_file(temp_path)
+            assert scale_id == 2
+            assert notes == [('B', 0.0625), ('C', 0.0625), ('E', 4.0625)]
+        
+        finally:
+            os.unlink(temp_path)
+    
+    def test_read_shawzin_file_invalid_time_char(self):
+        """Test that invalid time characters raise ValueError."""
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False,
+                                         encoding='utf-8') as f:
+            f.write("1BABC\u00e9A")
+            temp_path = f.name
+        
+        try:
+            with pytest.raises(ValueError):
+                read_shawzin_file(temp_path)
+        
+        finally:
+            os.unlink(temp_path)
+    
+    def test_read_shawzin_file_non_ascii_note_and_remainder(self):
+        """Test non-ASCII note characters and a trailing partial token are accepted."""
+        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False,
+                                         encoding='utf-8') as f:
+            f.write("1BAB\u00e9AB\u00e8")
+            temp_path = f.name
+        
+        try:
+            scale_id, notes = read_shawzin_file(temp_path)
+            assert scale_id == 1
+            assert [char for char, _ in notes] == ['B', '\u00e9']
+        
+        finally:
+            os.unlink(temp_path)
 
 
 class TestShawzinEncoder:
@@ -334,6 +401,30 @@ class TestShawzinEncoder:
         encoder2 = ShawzinEncoder(settings)
         assert encoder2.settings.seconds_per_tick == 0.125
     
+    def test_encoding_settings_frozen(self):
+        """Test that encoding settings are immutable and defaults are shared."""
+        settings = EncodingSettings()
+        with pytest.raises(AttributeError):
+            settings.scale_id = 3
+        
+        assert ShawzinEncoder().settings is ShawzinEncoder().settings
+    
+    def test_encoding_settings_derived_timing(self):
+        """Test precomputed timing constants."""
+        settings = EncodingSettings()
+        assert settings.ticks_per_measure == 64
+        assert settings.inv_seconds_per_tick == 16.0
+        
+        custom = EncodingSettings(seconds_per_measure=3.0, seconds_per_tick=0.125)
+        assert custom.ticks_per_measure == 24
+        assert custom == EncodingSettings(seconds_per_measure=3.0, seconds_per_tick=0.125)
+        assert custom.tpm_mask is None
+        
+        assert settings.tpm_mask == 63 and settings.tpm_shift == 6
+        pow2 = EncodingSettings(seconds_per_measure=4.0, seconds_per_tick=0.125)
+        assert pow2.tpm_mask == 31 and pow2.tpm_shift == 5
+        assert event_to_shawzin_token('1', 4.5, pow2) == '1' + BASE64_STR[1] + BASE64_STR[4]
+    
     def test_encode_events_melody_mode(self):
         """Test encoding in melody mode."""
         encoder = ShawzinEncoder()
@@ -355,6 +446,15 @@ class TestShawzinEncoder:
         assert len(chunks) >= 1
         assert encoder.stats['notes_encoded'] == 10
     
+    def test_encode_events_specialized_methods(self):
+        """Test that mode-specific methods match the dispatcher."""
+        encoder = ShawzinEncoder()
+        events = self.create_test_events(10)
+        
+        assert encoder.encode_events_melody(events) == encoder.encode_events(events, mode='melody')
+        assert encoder.encode_events_full(events) == encoder.encode_events(events, mode='full')
+        assert encoder.stats['notes_encoded'] == 10
+    
     def test_encode_to_file(self):
         """Test encoding to file."""
         encoder = ShawzinEncoder()
@@ -382,6 +482,15 @@ class TestShawzinEncoder:
         assert stats['notes_encoded'] == 8
         assert stats['total_duration'] > 0.0
     
+    def test_total_duration_unsorted_events(self):
+        """Test total duration falls back to a full scan for unsorted input."""
+        events = list(reversed(self.create_test_events(5)))
+        
+        encoder = ShawzinEncoder(EncodingSettings(events_sorted=False))
+        encoder.encode_events(events)
+        
+        assert encoder.get_encoding_stats()['total_duration'] == max(e.time_sec for e in events)
+    
     def test_validate_encoding(self):
         """Test encoding validation."""
         encoder = ShawzinEncoder()
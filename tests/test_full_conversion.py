@@ -9,7 +9,7 @@ import tempfile
 import mido
 import os
 from pathlib import Path
-from midi2shawzin.cli import convert_midi_file
+from midi2shawzin.cli import convert_midi_file, convert_batch, find_midi_files
 from midi2shawzin import convert_midi_to_shawzin
 from midi2shawzin.midi_io import read_midi, choose_melody_track, get_note_events, merge_note_events
 from midi2shawzin.key_detection import detect_key_from_events
@@ -120,6 +120,22 @@ class TestFullConversion:
         with pytest.raises(FileNotFoundError):
             convert_midi_file("nonexistent.mid")
             
+    def test_batch_conversion(self):
+        """Test converting a directory of MIDI files with worker processes."""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            for name in ('a.mid', 'b.mid'):
+                midi_file = self.create_synthetic_midi_file()
+                os.replace(midi_file, os.path.join(temp_dir, name))
+            Path(temp_dir, 'notes.txt').write_text('not midi')
+            
+            input_files = find_midi_files(temp_dir)
+            assert [Path(f).name for f in input_files] == ['a.mid', 'b.mid']
+            
+            results = convert_batch(input_files, jobs=2)
+            assert results == [(input_files[0], None), (input_files[1], None)]
+            assert Path(temp_dir, 'a.txt').exists()
+            assert Path(temp_dir, 'b.txt').exists()
+    
     def test_output_file_creation(self):
         """Test that output files are created correctly."""
         # TODO: Test output file creation and content
@@ -17,6 +17,7 @@ from midi2shawzin.key_detection import (
     analyze_key_confidence,
     get_scale_notes,
     SCALE_TEMPLATES,
+    SCALE_MASKS,
     SCALE_NAMES
 )
 
@@ -61,6 +62,15 @@ class TestKeyDetection:
         expected = {2, 4, 6, 7, 9, 11, 1}  # D major notes
         assert d_major == expected
     
+    def test_scale_masks_match_templates(self):
+        """Test precomputed masks agree with transposed templates."""
+        for scale_id, template in SCALE_TEMPLATES.items():
+            for root in range(12):
+                mask = SCALE_MASKS[scale_id][root]
+                expected = {(pc + root) % 12 for pc in template}
+                assert mask == sum(1 << pc for pc in expected)
+                assert get_scale_template(scale_id, root) == expected
+    
     def test_score_key(self):
         """Test key scoring function."""
         # Create histogram with strong C major pattern
@@ -170,6 +180,15 @@ class TestKeyDetection:
         assert scale_id == 7  # Pentatonic Major
         assert score > 0.8  # Good confidence
     
+    def test_detect_best_scale_tie_break_non_note_events(self):
+        """Test tie-breaking tolerates non-note events at either end."""
+        events = [Event(type='note', note=note, delta_sec=0.5, velocity=80)
+                  for note in (60, 62, 64, 65, 67, 69, 71)]  # C major, ties with its modes
+        events.append(Event(type='tempo', tempo=500000))
+        
+        root, scale_id, score = detect_best_scale(events)
+        assert (root, scale_id) == (0, 2)
+    
     def test_analyze_key_confidence(self):
         """Test confidence analysis with multiple candidates."""
         # Create C major scale events
@@ -214,6 +233,23 @@ class TestKeyDetection:
         assert isinstance(scale_name, str)
         assert detector.get_confidence() > 0
     
+    def test_key_detector_reuses_histogram(self):
+        """Test candidates from the last detection match a fresh analysis."""
+        detector = KeyDetector()
+        assert detector.get_key_candidates() == []
+        
+        events = [
+            Event(type='note', note=62, time_sec=0.0, delta_sec=0.5, velocity=80),  # D
+            Event(type='note', note=66, time_sec=0.5, delta_sec=0.5, velocity=80),  # F#
+            Event(type='note', note=69, time_sec=1.0, delta_sec=0.5, velocity=80),  # A
+        ]
+        detector.detect_key(events)
+        
+        assert detector.last_histogram == build_pitch_class_histogram(events)
+        assert detector.get_key_candidates(5) == analyze_key_confidence(events, top_n=5)
+        assert detect_best_scale(events, histogram=detector.last_histogram) == \
+            detector.last_analysis
+    
     def test_legacy_compatibility(self):
         """Test legacy function interface."""
         # Create simple events
@@ -7,8 +7,8 @@ Tests note-to-character mapping with closest-pitch algorithms.
 import pytest
 from midi2shawzin.mapper import (
     ShawzinNote, MappingSettings, ShawzinMapper,
-    build_playable_table, map_note_to_shawzin, analyze_note_coverage,
-    find_best_scale_for_notes, map_events_to_shawzin_events,
+    build_playable_table, map_note_to_shawzin, map_notes_batch, analyze_note_coverage,
+    find_best_scale_for_notes, map_events_to_shawzin_events, map_events_to_shawzin_arrays,
     map_notes_to_shawzin, quick_map_single_note, analyze_scale_compatibility
 )
 from midi2shawzin.midi_io import Event
@@ -49,6 +49,25 @@ class TestPlayableTable:
         with pytest.raises(ValueError):
             build_playable_table(scale_id=99)
     
+    def test_build_playable_table_memoized(self):
+        """Test that repeated builds return equal but independent lists."""
+        table1 = build_playable_table(2, octave_range=(3, 6))
+        table2 = build_playable_table(2, octave_range=(3, 6))
+        
+        assert table1 == table2
+        assert isinstance(table1, list)
+        table1.append((128, 'X'))
+        assert build_playable_table(2, octave_range=(3, 6)) == table2
+    
+    def test_build_playable_table_list_octave_range(self):
+        """Test that list octave ranges work like tuples, also via ShawzinMapper."""
+        assert build_playable_table(2, octave_range=[-1, 2]) == build_playable_table(2, octave_range=(-1, 2))
+        
+        mapper = ShawzinMapper(MappingSettings(octave_range=[-1, 2]))
+        events = [Event(type='note', note=60, time_sec=0.0, velocity=80),
+                  Event(type='note', note=64, time_sec=0.5, velocity=80)]
+        assert len(mapper.map_events(events)) == 2
+    
     def test_build_playable_table_different_scales(self):
         """Test different scale patterns."""
         scales_to_test = [1, 2, 3, 4, 5, 6, 7, 8, 9]
@@ -96,6 +115,16 @@ class TestNoteMapping:
         with pytest.raises(ValueError):
             map_note_to_shawzin(60, [])
     
+    def test_map_note_to_shawzin_caller_tuple_table(self):
+        """Test caller-built tuple tables, hashable or not, match the list path."""
+        pairs = [(55, 'B'), (60, 'C'), (67, 'E')]
+        unhashable = tuple((midi_note, [char]) for midi_note, char in pairs)
+        
+        for note in (50, 58, 61, 64, 70):
+            assert map_note_to_shawzin(note, tuple(pairs)) == map_note_to_shawzin(note, pairs)
+            char, mapped_midi, _ = map_note_to_shawzin(note, unhashable)
+            assert (char[0], mapped_midi) == map_note_to_shawzin(note, pairs)[:2]
+    
     def test_map_note_to_shawzin_closest_match(self):
         """Test closest pitch matching."""
         table = build_playable_table(scale_id=2)
@@ -107,6 +136,29 @@ class TestNoteMapping:
         assert isinstance(char, str)
         assert abs(mapped_midi - 61) <= 6  # Within reasonable range
 
+    
+    def test_map_note_to_shawzin_octave_shift(self):
+        """Test octave shift rounds to the nearest octave, half octaves down."""
+        for offset, expected_shift in [(0, 0), (5, 0), (6, 0), (7, 1), (12, 1), (18, 1),
+                                       (19, 2), (-5, 0), (-6, -1), (-7, -1), (-18, -2)]:
+            _, mapped_midi, octave_shift = map_note_to_shawzin(60, [(60 + offset, 'B')])
+            assert mapped_midi == 60 + offset
+            assert octave_shift == expected_shift
+    
+    def test_map_notes_batch_matches_single(self):
+        """Test batched binary search agrees with the linear scan, ties included."""
+        table = ((50, 'B'), (54, 'C'), (60, 'E'), (61, 'J'))
+        notes = list(range(40, 75))
+        
+        expected = [map_note_to_shawzin(note, list(table)) for note in notes]
+        assert map_notes_batch(notes, table) == expected
+        assert [map_note_to_shawzin(note, table) for note in notes] == expected
+        assert map_notes_batch([52], table)[0][1] == 50  # Tie goes to the lower note
+        
+        # Unsorted tables still work through the linear scan
+        assert map_notes_batch(notes, table[::-1]) == \
+            [map_note_to_shawzin(note, list(table[::-1])) for note in notes]
+
 
 class TestCoverageAnalysis:
     """Test note coverage analysis."""
@@ -204,6 +256,28 @@ class TestEventMapping:
             assert note.time_sec >= 0.0
             assert note.duration_sec >= 0.0
     
+    def test_map_events_to_shawzin_events_lookup(self):
+        """Test the per-MIDI-note lookup agrees with searching the table."""
+        events = [Event(type='note', time_sec=i * 0.1, delta_sec=0.1, note=note)
+                  for i, note in enumerate([0, 40, 61, 61, 95, 127])]
+        table = build_playable_table(scale_id=3)
+        
+        fast = map_events_to_shawzin_events(events, table)
+        searched = map_events_to_shawzin_events(events, list(table))
+        assert fast == searched
+    
+    def test_map_events_to_shawzin_arrays(self):
+        """Test the column-wise form matches the ShawzinNote list."""
+        events = [Event(type='note', time_sec=i * 0.25, delta_sec=0.25, note=note)
+                  for i, note in enumerate([48, 60, 61, 75, 60])]
+        events.insert(2, Event(type='tempo', tempo=500000))
+        table = build_playable_table(scale_id=2)
+        
+        arrays = map_events_to_shawzin_arrays(events, table)
+        assert len(arrays) == 5
+        assert arrays.to_list() == map_events_to_shawzin_events(events, table)
+        assert len(map_events_to_shawzin_arrays([], table)) == 0
+    
     def test_map_events_to_shawzin_events_consistency(self):
         """Test mapping consistency."""
         events = [
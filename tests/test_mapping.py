@@ -4,17 +4,24 @@ Test Shawzin Mapping Functions
 Unit tests for character mapping and constants.
 """
 
+import json
 import pytest
 from midi2shawzin.shawzin_mapping import (
     base64_chars,
+    BASE64_STR,
+    BASE64_BYTES,
     scaleModulo,
     scaleDict,
+    SHAWZIN_LUT,
     chordDict,
     load_scale_from_json,
     load_chord_dict,
     midi_to_pitch_class,
     pitch_class_to_name,
-    get_shawzin_char
+    PC_OF_MIDI,
+    NAME_OF_MIDI,
+    get_shawzin_char,
+    get_scale_lut
 )
 
 class TestShawzinMapping:
@@ -31,6 +38,11 @@ class TestShawzinMapping:
         assert "9" in base64_chars
         assert "+" in base64_chars
         assert "/" in base64_chars
+    
+    def test_base64_string_and_bytes_forms(self):
+        """Test that the str/bytes alphabets match base64_chars."""
+        assert list(BASE64_STR) == base64_chars
+        assert BASE64_BYTES.decode('ascii') == BASE64_STR
         
     def test_scale_modulo_structure(self):
         """Test scale modulo values."""
@@ -66,6 +78,13 @@ class TestShawzinMapping:
         assert pitch_class_to_name(11) == "B"
         assert pitch_class_to_name(12) == "C"  # Wraps around
         
+    def test_midi_note_lookup_tables(self):
+        """Test the per-MIDI-note tables agree with the helper functions."""
+        assert len(PC_OF_MIDI) == len(NAME_OF_MIDI) == 128
+        for midi_note in range(128):
+            assert PC_OF_MIDI[midi_note] == midi_to_pitch_class(midi_note)
+            assert NAME_OF_MIDI[midi_note] == pitch_class_to_name(midi_to_pitch_class(midi_note))
+        
     def test_get_shawzin_char(self):
         """Test getting Shawzin character for scale and index."""
         # Test valid scale and index
@@ -84,6 +103,23 @@ class TestShawzinMapping:
         char2 = get_shawzin_char(3, 12)  # Index 12 (wraps to 0 for chromatic)
         assert char1 == char2
         
+    def test_shawzin_lut_matches_scale_dict(self):
+        """Test the flat lookup table agrees with scaleDict lookups."""
+        assert len(SHAWZIN_LUT) == len(scaleModulo)
+        for scale_id, modulo in enumerate(scaleModulo, start=1):
+            assert len(SHAWZIN_LUT[scale_id - 1]) == modulo
+            for note_index in range(-modulo, 2 * modulo):
+                assert (get_shawzin_char(scale_id, note_index)
+                        == scaleDict[scale_id].get(note_index % modulo))
+        assert get_shawzin_char(0, 0) is None
+        
+        # Scales with identical tables share one row object
+        assert SHAWZIN_LUT[0] is SHAWZIN_LUT[1]
+        
+        assert get_scale_lut(3) is SHAWZIN_LUT[2]
+        with pytest.raises(ValueError):
+            get_scale_lut(10)
+        
     def test_load_functions_with_missing_files(self):
         """Test load functions handle missing files gracefully."""
         scales = load_scale_from_json("nonexistent.json")
@@ -91,3 +127,34 @@ class TestShawzinMapping:
         
         chords = load_chord_dict("nonexistent.json")
         assert chords == chordDict  # Should return default
+        
+        # Defaults come back as copies; the exported tables stay read-only
+        scales[1][0] = "X"
+        chords["custom"] = (0, 1)
+        assert scaleDict[1][0] != "X"
+        assert "custom" not in chordDict
+        with pytest.raises(TypeError):
+            scaleDict[1][0] = "X"
+        with pytest.raises(TypeError):
+            chordDict["custom"] = (0, 1)
+        
+    def test_load_functions_reuse_parse(self, tmp_path):
+        """Test repeated loads reuse the parse but return fresh containers."""
+        scale_file = tmp_path / "scales.json"
+        scale_file.write_text(json.dumps({"1": {"0": "B", "1": "C"}}), encoding='utf-8')
+        chord_file = tmp_path / "chords.json"
+        chord_file.write_text(json.dumps({"major": [0, 4, 7]}), encoding='utf-8')
+        
+        scales = load_scale_from_json(str(scale_file))
+        assert scales == {1: {0: "B", 1: "C"}}
+        scales[1][0] = "X"
+        assert load_scale_from_json(str(scale_file)) == {1: {0: "B", 1: "C"}}
+        
+        chords = load_chord_dict(str(chord_file))
+        assert chords == {"major": (0, 4, 7)}
+        chords["minor"] = (0, 3, 7)
+        assert load_chord_dict(str(chord_file)) == {"major": (0, 4, 7)}
+        
+        # Rewriting the file must invalidate the cached parse
+        chord_file.write_text(json.dumps({"minor": [0, 3, 7], "power": [0, 7]}), encoding='utf-8')
+        assert load_chord_dict(str(chord_file)) == {"minor": (0, 3, 7), "power": (0, 7)}
@@ -11,7 +11,8 @@ from midi2shawzin.metrics import (
     format_metrics_report,
     analyze_conversion_bottlenecks,
     compare_with_benchmark,
-    ConversionMetrics
+    ConversionMetrics,
+    _match_events_by_time
 )
 from midi2shawzin.midi_io import Event
 from midi2shawzin.mapper import ShawzinNote
@@ -111,6 +112,17 @@ class TestMetricsComputation:
         assert metrics.avg_abs_semitone_error == 0.0
         assert metrics.timing_rms == pytest.approx(0.1, abs=0.01)
     
+    def test_match_events_greedy_nearest(self):
+        """Test matching takes the nearest unused mapped note, lowest index on ties."""
+        original = [Event(type='note', note=60, time_sec=t) for t in (1.0, 1.0, 0.0, 5.0)]
+        mapped = [ShawzinNote('B', t, 0.1, 60, 60, 1, 0) for t in (1.05, 0.95, 1.0, 0.08, 3.0)]
+        
+        pairs = _match_events_by_time(original, mapped)
+        
+        assert [(o.time_sec if o else None, m.time_sec if m else None) for o, m in pairs] == [
+            (1.0, 1.0), (1.0, 1.05), (0.0, 0.08), (5.0, None), (None, 0.95), (None, 3.0)
+        ]
+    
     def test_empty_conversion_metrics(self):
         """Test metrics with no input events."""
         original = []
@@ -5,6 +5,7 @@ Unit tests for MIDI file reading and event processing.
 """
 
 import pytest
+import io
 import tempfile
 import os
 from pathlib import Path
@@ -19,6 +20,7 @@ except ImportError:
 from midi2shawzin.midi_io import (
     Event,
     read_midi,
+    read_midi_fh,
     choose_melody_track,
     ticks_to_seconds,
     get_note_events,
@@ -187,6 +189,65 @@ class TestMidiIO:
         assert first_note.velocity == 64
         assert first_note.event_type == 'note'
     
+    @pytest.mark.skipif(not MIDO_AVAILABLE, reason="mido not available")
+    def test_read_midi_file_cache(self, sample_midi_file):
+        """Test repeated legacy reads reuse the parse but not the objects."""
+        first = read_midi_file(sample_midi_file)
+        second = read_midi_file(sample_midi_file)
+        
+        assert first == second
+        assert first[0] is not second[0]
+        
+        # Rewriting the file must invalidate the cached notes
+        mid = mido.MidiFile()
+        track = mido.MidiTrack()
+        mid.tracks.append(track)
+        track.append(mido.Message('note_on', channel=0, note=72, velocity=90, time=0))
+        track.append(mido.Message('note_off', channel=0, note=72, velocity=0, time=480))
+        mid.save(sample_midi_file)
+        
+        rewritten = read_midi_file(sample_midi_file)
+        assert [e.note for e in rewritten] == [72]
+    
+    @pytest.mark.skipif(not MIDO_AVAILABLE, reason="mido not available")
+    def test_read_midi_channel_mask(self):
+        """Test percussion is dropped by default and channel_mask selects channels."""
+        mid = mido.MidiFile()
+        track = mido.MidiTrack()
+        mid.tracks.append(track)
+        track.append(mido.Message('note_on', channel=9, note=36, velocity=100, time=0))
+        track.append(mido.Message('note_off', channel=9, note=36, velocity=0, time=240))
+        track.append(mido.Message('note_on', channel=1, note=60, velocity=100, time=0))
+        track.append(mido.Message('note_off', channel=1, note=60, velocity=0, time=240))
+        
+        buffer = io.BytesIO()
+        mid.save(file=buffer)
+        
+        buffer.seek(0)
+        default = read_midi_fh(buffer)
+        assert {e.channel for e in get_note_events(default, 0)} == {1}
+        
+        buffer.seek(0)
+        drums_only = read_midi_fh(buffer, channel_mask=1 << 9)
+        assert {e.channel for e in get_note_events(drums_only, 0)} == {9}
+    
+    @pytest.mark.skipif(not MIDO_AVAILABLE, reason="mido not available")
+    def test_read_midi_fh_matches_read_midi(self, sample_midi_file):
+        """Test parsing from an open binary handle matches path-based reading."""
+        from_path = read_midi(sample_midi_file)
+        with open(sample_midi_file, 'rb') as fh:
+            from_fh = read_midi_fh(fh)
+        
+        assert from_fh == from_path
+    
+    def test_event_uses_slots(self):
+        """Test Event instances carry no per-instance __dict__."""
+        event = Event(type='note_on', note=60, time_sec=0.5)
+        
+        assert not hasattr(event, '__dict__')
+        with pytest.raises(AttributeError):
+            event.duration = 1.0
+    
     def test_invalid_midi_file(self):
         """Test handling of invalid MIDI files."""
         with pytest.raises(ValueError):
@@ -13,7 +13,10 @@ from midi2shawzin.pattern_detection import (
     PatternDetector,
     compress_shawzin_tokens,
     detect_song_structure,
-    rolling_hash
+    rolling_hash,
+    _find_pattern_occurrences,
+    _token_positions,
+    _repeat_groups_by_length
 )
 
 
@@ -42,6 +45,13 @@ class TestRollingHash:
         
         assert len(hashes) == 3
         assert hashes[0] == hashes[2]  # First and third windows are identical
+    
+    def test_rolling_hash_respects_token_boundaries(self):
+        """Test windows with equal concatenated text but different tokens hash apart."""
+        tokens = ['ab', 'c', 'a', 'bc']
+        hashes = rolling_hash(tokens, 2)
+        
+        assert hashes[0] != hashes[2]  # ['ab', 'c'] vs ['a', 'bc']
 
 
 class TestRepeatingSequences:
@@ -100,6 +110,19 @@ class TestRepeatingSequences:
         for start_indices, length in patterns:
             assert length >= 4  # At least minimum length
             assert len(start_indices) >= 2  # At least 2 occurrences
+    
+    def test_repeat_groups_match_brute_force(self):
+        """Test suffix-array grouping finds exactly the repeated windows of each length."""
+        ids = [1, 2, 1, 2, 3, 1, 2, 1, 2, 3, 1, 1]
+        groups_by_length = _repeat_groups_by_length(ids, 1, 6)
+        
+        for length in range(1, 7):
+            expected = {}
+            for i in range(len(ids) - length + 1):
+                expected.setdefault(tuple(ids[i:i + length]), []).append(i)
+            expected_groups = [g for g in expected.values() if len(g) >= 2]
+            
+            assert groups_by_length.get(length, []) == expected_groups
 
 
 class TestFoldRepeats:
@@ -144,6 +167,29 @@ class TestFoldRepeats:
         # Should detect multiple patterns
         assert len(patterns_dict) >= 1
         assert len(compressed) < len(tokens)
+    
+    def test_fold_repeats_overlapping_occurrences_roundtrip(self):
+        """Test self-overlapping occurrences are replaced without losing tokens."""
+        tokens = ['1AA'] * 4
+        compressed, patterns_dict = fold_repeats_into_refs(tokens, min_len=2, min_occurrences=2)
+        
+        assert compressed == ['@P1', '@P1']
+        assert expand_pattern_refs(compressed, patterns_dict) == tokens
+
+    
+    def test_find_pattern_occurrences_overlapping(self):
+        """Test occurrence scan reports every start, overlapping ones included."""
+        tokens = ['1AA', '1AA', '1AA', '2BB', '1AA', '1AA']
+        
+        assert _find_pattern_occurrences(tokens, ['1AA', '1AA']) == [0, 1, 4]
+        assert _find_pattern_occurrences(tokens, ['2BB', '1AA']) == [3]
+        assert _find_pattern_occurrences(tokens, ['3CC']) == []
+        assert _find_pattern_occurrences(tokens[:1], ['1AA', '1AA']) == []
+        
+        positions = _token_positions(tokens)
+        for pattern in (['1AA', '1AA'], ['2BB', '1AA'], ['3CC'], ['1AA', '1AA', '2BB']):
+            assert (_find_pattern_occurrences(tokens, pattern, positions)
+                    == _find_pattern_occurrences(tokens, pattern))
 
 
 class TestExpandPatternRefs:
@@ -14,12 +14,15 @@ from midi2shawzin.quantize import (
     quantize_beat_to_grid,
     add_humanization,
     quantize_events,
+    quantize_times,
     detect_tempo_from_events,
+    detect_tempo_from_times,
     quantize_to_sixteenth_notes,
     quantize_to_eighth_notes,
     quantize_with_humanization
 )
 from midi2shawzin.midi_io import Event
+from array import array
 
 
 class TestQuantizer:
@@ -276,3 +279,38 @@ class TestQuantizer:
         # Delta times should be preserved from original (not recalculated)
         assert quantized[0].delta_sec == pytest.approx(0.123, abs=1e-6)
         assert quantized[1].delta_sec == pytest.approx(0.124, abs=1e-6)
+    
+    def test_quantize_times_column(self):
+        """Test column quantization matches event quantization and keeps input order."""
+        times = array('d', [0.26, 0.123, 0.5])
+        settings = QuantizeSettings(subdivision=16)
+        events = [Event(type='note', note=60, time_sec=t, velocity=80) for t in times]
+        
+        quantized = quantize_times(times, 500_000, settings)
+        
+        assert quantized == [0.25, 0.125, 0.5]
+        assert sorted(quantized) == [e.time_sec for e in quantize_events(events, 480, 500_000, settings)]
+        assert detect_tempo_from_times(times) == detect_tempo_from_events(events)
+    
+    def test_quantize_events_copies_all_fields(self):
+        """Test quantized events keep every non-timing field and leave inputs untouched."""
+        event = Event(type='tempo', note=61, time_sec=0.26, delta_sec=0.1, velocity=90,
+                      channel=3, track_index=2, tempo=400_000, numerator=3, denominator=8)
+        
+        quantized = quantize_events([event], 480, 500_000, QuantizeSettings(subdivision=16))[0]
+        
+        assert quantized == Event(type='tempo', note=61, time_sec=0.25, delta_sec=0.25, velocity=90,
+                                  channel=3, track_index=2, tempo=400_000, numerator=3, denominator=8)
+        assert event.time_sec == 0.26
+    
+    def test_seeded_quantizer_humanization_is_reproducible(self):
+        """Test seeded quantizers draw jitter from their own generator."""
+        events = [Event(type='note', note=60, time_sec=i * 0.25, velocity=80) for i in range(8)]
+        settings = QuantizeSettings(subdivision=16, humanize_ms=10.0)
+        
+        first = Quantizer(settings, seed=42).quantize(events, tempo_bpm=120.0)
+        second = Quantizer(settings, seed=42).quantize(events, tempo_bpm=120.0)
+        
+        assert [e.time_sec for e in first] == [e.time_sec for e in second]
+        for original, quantized in zip(events, first):
+            assert abs(quantized.time_sec - original.time_sec) <= 0.010 + 1e-9